@@ -80,23 +80,13 @@ def websearch_example():
 
         response = client.get_websearch_response(
             prompt=prompt,
-            system_message=system_message,
-            search_count=5  # Get 5 search results
+            is_json_response=False,  # Plain text answer, not a JSON payload
+            system_message=system_message
         )
 
         print(f"Prompt: {prompt}")
         print(f"System Message: {system_message}")
-        print(f"Response Content: {response['content']}")
-
-        # Print citations if available
-        if response['citations']:
-            print("\nCitations:")
-            for i, citation in enumerate(response['citations'], 1):
-                print(f"{i}. {citation['title']}")
-                print(f"   URL: {citation['url']}")
-                print(f"   Snippet: {citation['snippet'][:100]}...")
-        else:
-            print("\nNo citations available.")
+        print(f"Response Content: {response}")
 
     except ValueError as e:
         print(f"Error: {e}")
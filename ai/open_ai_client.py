@@ -2,11 +2,120 @@
 Utility functions and classes for the AI app.
 This module contains utilities for interacting with AI services.
 """
+import asyncio
+import atexit
+import hashlib
+import json
 import os
-import re
+import threading
+import weakref
+from contextlib import asynccontextmanager
 from typing import Optional, List, Dict, Any
 
-from openai import OpenAI
+import httpx
+import tiktoken
+from aiolimiter import AsyncLimiter
+from cachetools import LRUCache
+from django.conf import settings
+from django.core.cache import cache
+from openai import AsyncOpenAI, RateLimitError
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_random_exponential
+
+
+# Retry residual 429s that slip past the client-side limiters
+_retry_on_rate_limit = retry(
+    wait=wait_random_exponential(min=1, max=60),
+    stop=stop_after_attempt(6),
+    retry=retry_if_exception_type(RateLimitError),
+    reraise=True,
+)
+
+
+# Markers wrapped around JSON completions by reasoning / chat models
+_THINK_CLOSE = "</think>"
+_JSON_FENCE_PREFIX = "```json"
+_JSON_FENCE_SUFFIX = "```"
+
+JSON_OBJECT_FORMAT = {"type": "json_object"}
+
+# Completion cache: per-instance LRU in front of the shared Django cache; the
+# Django layer is skipped when the client runs without Django settings
+RESPONSE_CACHE_SIZE = 1024
+RESPONSE_CACHE_TTL = 60 * 60 * 24
+RESPONSE_CACHE_PREFIX = "openai:chat:"
+
+# Connection pool shared by every OpenAIClient instance. HTTP/2 multiplexes
+# concurrent requests over one TLS connection (falls back to 1.1 via ALPN).
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+HTTP_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+
+# Multi-task prompts stay under ~80% of a 128k context window; larger
+# groups are sent as concurrent single-task requests instead
+MULTI_PROMPT_MAX_TOKENS = 100_000
+MULTI_PROMPT_INSTRUCTION = (
+    "Return a JSON array; for each numbered task return the corresponding "
+    "JSON object, in the same order.\n\n"
+)
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+BATCH_TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+# httpx async connections are tied to the event loop that opened them, so the
+# process keeps one AsyncOpenAI per loop. Sync callers all run on a single
+# background loop, which keeps their pool (and TLS sessions) warm across calls.
+_shared_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = (
+    weakref.WeakKeyDictionary()
+)
+# Web searches in flight per event loop, keyed like the response cache
+_inflight_websearches: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Future]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+_sync_loop: Optional[asyncio.AbstractEventLoop] = None
+_sync_loop_lock = threading.Lock()
+
+
+def _get_shared_async_client(api_key: str) -> AsyncOpenAI:
+    loop = asyncio.get_running_loop()
+    client = _shared_async_clients.get(loop)
+    if client is None:
+        client = AsyncOpenAI(
+            api_key=api_key,
+            http_client=httpx.AsyncClient(http2=True, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT),
+        )
+        _shared_async_clients[loop] = client
+    return client
+
+
+def _close_sync_loop_client():
+    client = _shared_async_clients.get(_sync_loop) if _sync_loop else None
+    if client is not None:
+        asyncio.run_coroutine_threadsafe(client.close(), _sync_loop).result(timeout=5)
+
+
+def _run_sync(coro):
+    """Run a coroutine on the shared background loop and block until it finishes."""
+    global _sync_loop
+    with _sync_loop_lock:
+        if _sync_loop is None:
+            _sync_loop = asyncio.new_event_loop()
+            threading.Thread(target=_sync_loop.run_forever, name="openai-client", daemon=True).start()
+            atexit.register(_close_sync_loop_client)
+    return asyncio.run_coroutine_threadsafe(coro, _sync_loop).result()
+
+
+async def _shared_cache_get(key: str) -> Optional[str]:
+    """Read a cached response from the Django cache, if Django is configured."""
+    if not settings.configured:
+        return None
+    return await cache.aget(key)
+
+
+async def _shared_cache_set(key: str, value: str) -> None:
+    """Store a response in the Django cache, if Django is configured."""
+    if settings.configured:
+        await cache.aset(key, value, RESPONSE_CACHE_TTL)
 
 
 class OpenAIClient:
@@ -17,53 +126,166 @@ class OpenAIClient:
     including web search capabilities for retrieving up-to-date information.
     It reads the API key from the environment variables.
 
+    Requests are made through a process-wide ``AsyncOpenAI`` with a pooled
+    ``httpx.AsyncClient``, so instances are cheap to create and reuse warm
+    connections. The ``a``-prefixed methods are coroutines; the plain methods
+    are blocking wrappers kept for sync callers.
+    Every request is throttled client-side to the configured requests- and
+    tokens-per-minute budgets, and retried with backoff on rate-limit errors.
+    The two layers compose: the semaphore caps in-flight requests (sockets and
+    buffers held locally), the limiters pace what is sent to the API.
+
+    Chat completions are cached by (model, temperature, system message, prompt)
+    in an in-process LRU backed by Django's cache, so identical prompts are
+    answered without another API call. Pass ``use_cache=False`` to bypass it.
+
     Usage:
         # Basic chat completion
         client = OpenAIClient(model="gpt-4", temperature=0.5)
         response = client.get_chat_completion("Tell me a joke")
 
-        # Web search enabled completion
+        # Web search enabled completion (returns the answer text)
         client = OpenAIClient(model="gpt-4-turbo")
-        result = client.get_websearch_response("What are the latest developments in AI?")
-        content = result['content']
-        citations = result['citations']
+        content = client.get_websearch_response(
+            "What are the latest developments in AI?", is_json_response=False
+        )
+
+        # JSON mode, parsed for you
+        place = client.get_json_completion(user_prompt, system_message=system_prompt)
+
+        # Several prompts at once, sent concurrently
+        responses = client.get_chat_completions_batch(["First prompt", "Second prompt"])
+
+        # Several JSON extraction tasks folded into a single request
+        objects = client.get_chat_completions_multi(prompts, system_message)
+
+        # Non-interactive workloads through the Batch API (cheaper, up to 24h)
+        batch_id = client.submit_batch(prompts)
+        client.poll_batch(batch_id)
+        results = client.fetch_batch_results(batch_id)
     """
 
-    def __init__(self, model: str = "gpt-4.1-mini-2025-04-14", temperature: float = 0.3):
+    __slots__ = (
+        "api_key",
+        "model",
+        "temperature",
+        "country",
+        "response_cache",
+        "max_concurrent",
+        "_sem",
+        "_sem_loop",
+        "req_limiter",
+        "tok_limiter",
+        "encoding",
+    )
+
+    def __init__(
+        self,
+        model: str = "gpt-4.1-mini-2025-04-14",
+        temperature: float = 0.3,
+        requests_per_minute: int = 200,
+        tokens_per_minute: int = 40000,
+        max_concurrent: int = 8,
+    ):
         """
         Initialize the OpenAI client with the API key from environment variables.
 
         Args:
             model: The OpenAI model to use (default: gpt-3.5-turbo)
             temperature: Controls randomness (0-1, lower is more deterministic)
+            requests_per_minute: Client-side request budget (RPM)
+            tokens_per_minute: Client-side prompt token budget (TPM)
+            max_concurrent: Maximum number of requests in flight at once
         """
         api_key = os.getenv('OPENAI_API_KEY')
         if not api_key:
             raise ValueError("OPENAI_API_KEY environment variable is not set")
 
-        self.client = OpenAI(api_key=api_key)
+        self.api_key = api_key
         self.model = model
         self.temperature = temperature
         self.country = "SK"
 
+        self.response_cache = LRUCache(maxsize=RESPONSE_CACHE_SIZE)
+
+        self.max_concurrent = max_concurrent
+        self._sem = None
+        self._sem_loop = None
+        self.req_limiter = AsyncLimiter(requests_per_minute, 60)
+        self.tok_limiter = AsyncLimiter(tokens_per_minute, 60)
+        try:
+            self.encoding = tiktoken.encoding_for_model(model)
+        except KeyError:
+            self.encoding = tiktoken.get_encoding("o200k_base")
+
+    def _estimate_tokens(self, *texts: Optional[str]) -> int:
+        return sum(len(self.encoding.encode(text)) for text in texts if text)
+
+    def _response_cache_key(
+        self,
+        prompt: str,
+        system_message: Optional[str],
+        response_format: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        # Whitespace is normalized so re-indented prompts share an entry
+        raw = "|".join((
+            self.model,
+            str(self.temperature),
+            json.dumps(response_format, sort_keys=True) if response_format else "",
+            " ".join((system_message or "").split()),
+            " ".join(prompt.split()),
+        ))
+        return RESPONSE_CACHE_PREFIX + hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        """The shared AsyncOpenAI for the running event loop."""
+        return _get_shared_async_client(self.api_key)
+
+    @property
+    def sem(self) -> asyncio.Semaphore:
+        """
+        Concurrency cap for the running event loop.
+
+        Semaphores bind to the loop they first wait on, and the instance may be
+        used both from the sync wrappers' loop and from an async caller's loop.
+        """
+        loop = asyncio.get_running_loop()
+        if self._sem_loop is not loop:
+            self._sem = asyncio.Semaphore(self.max_concurrent)
+            self._sem_loop = loop
+        return self._sem
+
+    @asynccontextmanager
+    async def _rate_limited(self, *texts: Optional[str]):
+        """Hold a concurrency slot, one request slot and the estimated prompt tokens for the duration of a call."""
+        tokens = min(self._estimate_tokens(*texts), self.tok_limiter.max_rate)
+        async with self.sem:
+            async with self.req_limiter:
+                if tokens:
+                    await self.tok_limiter.acquire(tokens)
+                yield
+
     def __get_json_string_from_completion(self, completion: str | None):
+        # Fallback for replies that cannot use JSON mode (web search, arrays)
         if completion is None:
             return None
 
-        split_completion = completion.split("</think>")
-        without_thinking = split_completion[-1] if "<think>" in completion else completion
-        cleaned = (
-            re.sub(r"^```json\s*|\s*```$", "", without_thinking.strip())
-            if "json" in without_thinking
-            else without_thinking.strip()
+        without_thinking = completion.rpartition(_THINK_CLOSE)[2] or completion
+        return (
+            without_thinking.strip()
+            .removeprefix(_JSON_FENCE_PREFIX)
+            .removesuffix(_JSON_FENCE_SUFFIX)
+            .strip()
         )
-        return cleaned
-
 
-    def get_chat_completion(
-        self, 
-        prompt: str, 
-        system_message: Optional[str] = None
+    @_retry_on_rate_limit
+    async def aget_chat_completion(
+        self,
+        prompt: str,
+        system_message: Optional[str] = None,
+        use_cache: bool = True,
+        response_format: Optional[Dict[str, Any]] = None,
     ) -> str:
         """
         Generate a chat completion using OpenAI's API.
@@ -71,10 +293,21 @@ class OpenAIClient:
         Args:
             prompt: The user's input prompt
             system_message: Optional system message to set context
+            use_cache: Return a cached response for an identical prompt if available
+            response_format: Optional response format, e.g. {"type": "json_object"}
 
         Returns:
             The generated text response
         """
+        cache_key = self._response_cache_key(prompt, system_message, response_format)
+        if use_cache:
+            cached = self.response_cache.get(cache_key)
+            if cached is None:
+                cached = await _shared_cache_get(cache_key)
+            if cached is not None:
+                self.response_cache[cache_key] = cached
+                return cached
+
         messages = []
 
         # Add system message if provided
@@ -84,26 +317,320 @@ class OpenAIClient:
         # Add user message
         messages.append({"role": "user", "content": prompt})
 
+        extra_params = {"response_format": response_format} if response_format else {}
+
         # Create completion
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=messages,
-            temperature=self.temperature
-        )
+        async with self._rate_limited(system_message, prompt):
+            response = await self.async_client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=self.temperature,
+                **extra_params
+            )
+
+        content = response.choices[0].message.content
+        if content is not None:
+            self.response_cache[cache_key] = content
+            await _shared_cache_set(cache_key, content)
 
         # Return the generated text
-        return response.choices[0].message.content
+        return content
 
-    def get_websearch_response(
+    async def aget_json_completion(
         self,
         prompt: str,
-        is_json_reponse: bool = True,
+        system_message: Optional[str] = None,
+        use_cache: bool = True,
     ) -> Dict[str, Any]:
+        """
+        Generate a chat completion in JSON mode and return it parsed.
 
-        response =  self.client.responses.create(
-            model=self.model,
-            tools=[{"type": "web_search_preview"}],
-            input=prompt,
-            temperature=self.temperature
+        The model is constrained to emit a single JSON object, so no code fence
+        stripping is needed. JSON mode requires the messages to mention JSON,
+        which the extraction prompts in ai.prompts already do.
+
+        Args:
+            prompt: The user's input prompt
+            system_message: Optional system message to set context
+            use_cache: Return a cached response for an identical prompt if available
+
+        Returns:
+            The parsed JSON object
+        """
+        content = await self.aget_chat_completion(
+            prompt, system_message, use_cache, response_format=JSON_OBJECT_FORMAT
+        )
+        return json.loads(content)
+
+    async def aget_chat_completions_batch(
+        self,
+        prompts: List[str],
+        system_message: Optional[str] = None,
+        use_cache: bool = True,
+    ) -> List[str]:
+        """
+        Generate chat completions for several prompts concurrently.
+
+        Args:
+            prompts: The user prompts to complete
+            system_message: Optional system message shared by all prompts
+            use_cache: Return cached responses for identical prompts if available
+
+        Returns:
+            The generated text responses, in the same order as ``prompts``
+        """
+        return await asyncio.gather(
+            *(self.aget_chat_completion(prompt, system_message, use_cache) for prompt in prompts)
         )
-        return response.output_text if not is_json_reponse else self.__get_json_string_from_completion(response.output_text)
+
+    async def aget_chat_completions_multi(
+        self,
+        prompts: List[str],
+        system_message: Optional[str] = None,
+    ) -> List[str]:
+        """
+        Answer several JSON extraction tasks with a single chat completion.
+
+        The tasks are numbered and combined into one user message, so they share
+        one request slot and one copy of the system message. Intended for 5-10
+        structured prompts (e.g. place reviews) when the RPM limit, not TPM, is
+        the bottleneck. If the combined prompt exceeds MULTI_PROMPT_MAX_TOKENS or
+        the reply is not a JSON array with one item per task, the prompts are
+        sent individually via :meth:`aget_chat_completions_batch`.
+
+        Args:
+            prompts: The task prompts, each expected to produce one JSON object
+            system_message: Optional system message shared by all tasks
+
+        Returns:
+            One JSON string per prompt, in the same order as ``prompts``
+        """
+        combined = MULTI_PROMPT_INSTRUCTION + "\n---\n".join(
+            f"[{index}] {prompt}" for index, prompt in enumerate(prompts)
+        )
+        if len(prompts) < 2 or self._estimate_tokens(system_message, combined) > MULTI_PROMPT_MAX_TOKENS:
+            return await self.aget_chat_completions_batch(prompts, system_message)
+
+        response = await self.aget_chat_completion(combined, system_message)
+        try:
+            items = json.loads(self.__get_json_string_from_completion(response))
+        except (TypeError, ValueError):
+            items = None
+        if not isinstance(items, list) or len(items) != len(prompts):
+            return await self.aget_chat_completions_batch(prompts, system_message)
+
+        return [json.dumps(item) for item in items]
+
+    async def aget_websearch_response(
+        self,
+        prompt: str,
+        is_json_response: bool = True,
+        system_message: Optional[str] = None,
+        use_cache: bool = True,
+    ) -> Optional[str]:
+        """
+        Answer a prompt with the web search tool enabled.
+
+        Identical requests that arrive while one is already in flight on the
+        same event loop (e.g. several reviewers opening the same post) wait
+        for that call instead of starting their own. Answers are cached like
+        chat completions, so reviewing the same place again is free.
+
+        Args:
+            prompt: The user's input prompt
+            is_json_response: Strip reasoning and code fences around a JSON reply
+            system_message: Optional instructions for the model
+            use_cache: Return a cached response for an identical prompt if available
+
+        Returns:
+            The response text
+        """
+        key = self._websearch_key(prompt, system_message)
+        output_text = None
+        if use_cache:
+            output_text = self.response_cache.get(key)
+            if output_text is None:
+                output_text = await _shared_cache_get(key)
+                if output_text is not None:
+                    self.response_cache[key] = output_text
+
+        if output_text is None:
+            inflight = _inflight_websearches.setdefault(asyncio.get_running_loop(), {})
+            task = inflight.get(key)
+            if task is None:
+                task = asyncio.ensure_future(self._websearch(prompt, system_message))
+                inflight[key] = task
+                task.add_done_callback(lambda _: inflight.pop(key, None))
+
+            # Shielded so a caller giving up does not cancel the call for the others
+            output_text = await asyncio.shield(task)
+            if output_text:
+                self.response_cache[key] = output_text
+                await _shared_cache_set(key, output_text)
+
+        return output_text if not is_json_response else self.__get_json_string_from_completion(output_text)
+
+    def _websearch_key(self, prompt: str, system_message: Optional[str]) -> str:
+        return self._response_cache_key(prompt, system_message, {"tool": "web_search_preview", "country": self.country})
+
+    @_retry_on_rate_limit
+    async def _websearch(self, prompt: str, system_message: Optional[str]) -> str:
+        # The system message goes in `instructions`, ahead of the input, so a
+        # static instruction block forms a cacheable prompt prefix
+        async with self._rate_limited(system_message, prompt):
+            response = await self.async_client.responses.create(
+                model=self.model,
+                tools=[{
+                    "type": "web_search_preview",
+                    "user_location": {"type": "approximate", "country": self.country},
+                }],
+                instructions=system_message,
+                input=prompt,
+                temperature=self.temperature
+            )
+        return response.output_text
+
+    def get_chat_completion(
+        self,
+        prompt: str,
+        system_message: Optional[str] = None,
+        use_cache: bool = True,
+    ) -> str:
+        """Blocking wrapper around :meth:`aget_chat_completion`."""
+        return _run_sync(self.aget_chat_completion(prompt, system_message, use_cache))
+
+    def get_json_completion(
+        self,
+        prompt: str,
+        system_message: Optional[str] = None,
+        use_cache: bool = True,
+    ) -> Dict[str, Any]:
+        """Blocking wrapper around :meth:`aget_json_completion`."""
+        return _run_sync(self.aget_json_completion(prompt, system_message, use_cache))
+
+    def get_chat_completions_batch(
+        self,
+        prompts: List[str],
+        system_message: Optional[str] = None,
+        use_cache: bool = True,
+    ) -> List[str]:
+        """Blocking wrapper around :meth:`aget_chat_completions_batch`."""
+        return _run_sync(self.aget_chat_completions_batch(prompts, system_message, use_cache))
+
+    def get_chat_completions_multi(
+        self,
+        prompts: List[str],
+        system_message: Optional[str] = None,
+    ) -> List[str]:
+        """Blocking wrapper around :meth:`aget_chat_completions_multi`."""
+        return _run_sync(self.aget_chat_completions_multi(prompts, system_message))
+
+    def get_websearch_response(
+        self,
+        prompt: str,
+        is_json_response: bool = True,
+        system_message: Optional[str] = None,
+        use_cache: bool = True,
+    ) -> Optional[str]:
+        """Blocking wrapper around :meth:`aget_websearch_response`."""
+        return _run_sync(self.aget_websearch_response(prompt, is_json_response, system_message, use_cache))
+
+    async def asubmit_batch(self, prompts: List[str], system_message: Optional[str] = None) -> str:
+        """
+        Submit prompts to the OpenAI Batch API.
+
+        Batch jobs are processed server-side within 24 hours at a lower price and
+        do not count against the synchronous rate limits, so they suit
+        non-interactive extraction work such as bulk place reviews.
+
+        Args:
+            prompts: The user prompts to complete; the index is used as custom_id
+            system_message: Optional system message shared by all prompts
+
+        Returns:
+            The id of the created batch
+        """
+        lines = []
+        for index, prompt in enumerate(prompts):
+            messages = []
+            if system_message:
+                messages.append({"role": "system", "content": system_message})
+            messages.append({"role": "user", "content": prompt})
+            lines.append(json.dumps({
+                "custom_id": str(index),
+                "method": "POST",
+                "url": BATCH_ENDPOINT,
+                "body": {
+                    "model": self.model,
+                    "messages": messages,
+                    "temperature": self.temperature,
+                },
+            }))
+
+        input_file = await self.async_client.files.create(
+            file=("batch.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch",
+        )
+        batch = await self.async_client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window="24h",
+        )
+        return batch.id
+
+    async def apoll_batch(self, batch_id: str, interval: float = 30.0):
+        """
+        Wait until a batch reaches a terminal status.
+
+        Args:
+            batch_id: The id returned by :meth:`asubmit_batch`
+            interval: Seconds to sleep between status checks
+
+        Returns:
+            The final Batch object
+        """
+        while True:
+            batch = await self.async_client.batches.retrieve(batch_id)
+            if batch.status in BATCH_TERMINAL_STATUSES:
+                return batch
+            await asyncio.sleep(interval)
+
+    async def afetch_batch_results(self, batch_id: str) -> List[Optional[str]]:
+        """
+        Download the output of a finished batch.
+
+        Args:
+            batch_id: The id returned by :meth:`asubmit_batch`
+
+        Returns:
+            The completion text per prompt, in submission order, with JSON code
+            fences stripped; None for prompts that failed or are missing
+        """
+        batch = await self.async_client.batches.retrieve(batch_id)
+        results: List[Optional[str]] = [None] * batch.request_counts.total
+        if not batch.output_file_id:
+            return results
+
+        output = await self.async_client.files.content(batch.output_file_id)
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            response = row.get("response") or {}
+            if response.get("status_code") != 200:
+                continue
+            content = response["body"]["choices"][0]["message"]["content"]
+            results[int(row["custom_id"])] = self.__get_json_string_from_completion(content)
+        return results
+
+    def submit_batch(self, prompts: List[str], system_message: Optional[str] = None) -> str:
+        """Blocking wrapper around :meth:`asubmit_batch`."""
+        return _run_sync(self.asubmit_batch(prompts, system_message))
+
+    def poll_batch(self, batch_id: str, interval: float = 30.0):
+        """Blocking wrapper around :meth:`apoll_batch`."""
+        return _run_sync(self.apoll_batch(batch_id, interval))
+
+    def fetch_batch_results(self, batch_id: str) -> List[Optional[str]]:
+        """Blocking wrapper around :meth:`afetch_batch_results`."""
+        return _run_sync(self.afetch_batch_results(batch_id))
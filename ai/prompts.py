@@ -1,17 +1,4 @@
-def get_place_review_prompt(name: str, city: str, types: list[str] = []) -> str:
-    def build_user_prompt() -> str:
-        type_str = ", ".join(types)
-        base_prompt = f"""
-    Gather detailed information about the place called "{name}".
-    """
-        if city:
-            base_prompt += f'It may be located in the city "{city}".\n'
-        if types:
-            base_prompt += f"Possible types include: {type_str}.\n"
-
-        return base_prompt.strip()
-
-    system_prompt = """
+_PLACE_REVIEW_SYSTEM_PROMPT = """
     You are a data extraction assistant designed to identify and structure information about places that are interesting for parents with children.
 
     Your task is to extract detailed structured information about a specific place (e.g., playground, restaurant, zoo, etc.) located primarily in Slovakia or neighboring countries. You are allowed to use your general knowledge and common sense, but you must prefer information from Slovakia unless clearly specified otherwise.
@@ -68,9 +55,25 @@ def get_place_review_prompt(name: str, city: str, types: list[str] = []) -> str:
     Never return any explanation or text outside the JSON. If information is ambiguous, fill in reasonable defaults as specified.
     """.strip()
 
-    user_prompt = build_user_prompt()
 
-    return f"{system_prompt} \n {user_prompt}"
+def get_place_review_prompt(name: str, city: str, types: list[str] = []) -> tuple[str, str]:
+    """
+    Build the place review prompt as (system_prompt, user_prompt).
+
+    The system prompt is the same constant for every place so it can be sent as
+    the system message and reused by OpenAI's prompt caching; only the user
+    prompt varies.
+    """
+    type_str = ", ".join(types)
+    user_prompt = f"""
+    Gather detailed information about the place called "{name}".
+    """
+    if city:
+        user_prompt += f'It may be located in the city "{city}".\n'
+    if types:
+        user_prompt += f"Possible types include: {type_str}.\n"
+
+    return _PLACE_REVIEW_SYSTEM_PROMPT, user_prompt.strip()
 
 
 class Prompts:
@@ -0,0 +1,75 @@
+"""
+JWT authentication backend used by the GraphQL middleware.
+
+This module narrows djangorestframework-simplejwt's user lookup to the columns
+the GraphQL layer actually reads, so authenticating a request loads the role
+together with the user in a single small query. Verified tokens are reused
+for a few seconds through auth_api.jwt_cache.
+"""
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import Token
+
+from auth_api import jwt_cache
+
+# Fields read by the permission classes and auth resolvers, plus every UserType
+# field so the me resolver can return request.user without deferred loads
+JWT_USER_FIELDS = ('id', 'username', 'email', 'role', 'is_active', 'first_name', 'last_name', 'date_joined')
+
+
+class GraphQLJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that fetches only the fields needed for GraphQL auth checks.
+    """
+
+    def get_validated_token(self, raw_token: bytes) -> Token:
+        """
+        Validate a raw token, reusing a recent verification of the same token.
+
+        Args:
+            raw_token: The raw JWT from the Authorization header
+
+        Returns:
+            The validated token
+
+        Raises:
+            InvalidToken: If the token fails verification (failures are not cached)
+        """
+        validated_token = jwt_cache.get(raw_token)
+        if validated_token is None:
+            validated_token = super().get_validated_token(raw_token)
+            jwt_cache.set(raw_token, validated_token)
+        return validated_token
+
+    def get_user(self, validated_token: Token):
+        """
+        Return the user referenced by a validated token.
+
+        Args:
+            validated_token: A token that has already passed signature and expiry checks
+
+        Returns:
+            The user instance with only JWT_USER_FIELDS loaded
+
+        Raises:
+            InvalidToken: If the token has no user id claim
+            AuthenticationFailed: If the user does not exist or is inactive
+        """
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        try:
+            user = self.user_model.objects.only(*JWT_USER_FIELDS).get(
+                **{api_settings.USER_ID_FIELD: user_id}
+            )
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        return user
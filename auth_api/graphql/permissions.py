@@ -3,7 +3,8 @@ Permission classes for GraphQL API authentication and authorization.
 
 This module provides reusable permission classes that can be used with
 Strawberry GraphQL to protect fields and mutations based on authentication
-status and user roles.
+status and user roles. The checks read the flags that JWTAuthMiddleware
+resolves once per request.
 """
 import typing
 
@@ -12,8 +13,6 @@ from django.contrib.auth.models import AnonymousUser
 from strawberry.permission import BasePermission
 from strawberry.types import Info
 
-from users.models import UserRole
-
 
 class IsAuthenticated(BasePermission):
     message = "User is not authenticated"
@@ -21,8 +20,7 @@ class IsAuthenticated(BasePermission):
     def has_permission(self, source, info: Info, **kwargs) -> bool:
         if info.context['request'] is None:
             return False
-        is_authenticated = info.context['request'].user.pk is not None
-        return is_authenticated
+        return info.context['request']._is_authenticated
 
 
 class IsAdmin(BasePermission):
@@ -34,5 +32,4 @@ class IsAdmin(BasePermission):
     ) -> bool:
         if info.context['request'] is None:
             return False
-        role  = info.context.request.user.role
-        return role == UserRole.ADMIN
+        return info.context['request']._is_admin
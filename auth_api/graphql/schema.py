@@ -5,21 +5,29 @@ This module defines GraphQL types and mutations for JWT-based authentication,
 including login, token refresh, and logout operations. It provides a clean
 separation between authentication logic and user management.
 """
+import logging
+
 import strawberry
-import typing
 
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.contrib.auth import authenticate
 from strawberry.types import Info
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 from rest_framework_simplejwt.tokens import RefreshToken
 
+logger = logging.getLogger(__name__)
+
+ROTATE_REFRESH_TOKENS = settings.SIMPLE_JWT.get('ROTATE_REFRESH_TOKENS', False)
+
+
 # JWT Token types
 @strawberry.type
 class JWTToken:
     """Represents a JWT token with its type and value."""
     token: str
     token_type: str = "access"
-    expires_at: typing.Optional[str] = None
+    expires_at: str | None = None
 
 
 @strawberry.type
@@ -43,7 +51,7 @@ class AuthUserType:
     """Minimal user information returned in authentication responses."""
     id: strawberry.ID
     username: str
-    email: typing.Optional[str] = None
+    email: str | None = None
 
 
 # Login result type
@@ -52,8 +60,8 @@ class LoginResult:
     """Result of a login attempt."""
     success: bool
     message: str
-    tokens: typing.Optional[TokenPair] = None
-    user: typing.Optional[AuthUserType] = None
+    tokens: TokenPair | None = None
+    user: AuthUserType | None = None
 
 
 # Token refresh input
@@ -69,7 +77,7 @@ class RefreshTokenResult:
     """Result of a token refresh attempt."""
     success: bool
     message: str
-    tokens: typing.Optional[TokenPair] = None
+    tokens: TokenPair | None = None
 
 
 # Logout input
@@ -91,7 +99,7 @@ class LogoutResult:
 @strawberry.type
 class Mutation:
     @strawberry.mutation
-    def login(self, info: Info, input: LoginInput) -> LoginResult:
+    async def login(self, info: Info, input: LoginInput) -> LoginResult:
         """
         Authenticate a user and return JWT tokens if successful.
         
@@ -102,7 +110,8 @@ class Mutation:
         Returns:
             LoginResult containing success status, message, tokens (if successful), and user info
         """
-        user = authenticate(username=input.username, password=input.password)
+        # authenticate() and for_user() hit the database, keep them off the event loop
+        user = await sync_to_async(authenticate)(username=input.username, password=input.password)
         
         if user is None:
             return LoginResult(
@@ -116,14 +125,12 @@ class Mutation:
                 message="User account is disabled"
             )
         
-        # Generate tokens
-        refresh = RefreshToken.for_user(user)
-        access_token = str(refresh.access_token)
-        refresh_token = str(refresh)
-        
-        # Create token objects
-        access = JWTToken(token=access_token, token_type="access")
-        refresh = JWTToken(token=refresh_token, token_type="refresh")
+        # Generate tokens, signing each one once
+        refresh = await sync_to_async(RefreshToken.for_user)(user)
+        tokens = TokenPair(
+            access=JWTToken(token=str(refresh.access_token), token_type="access"),
+            refresh=JWTToken(token=str(refresh), token_type="refresh")
+        )
         
         # Create a minimal UserType for the response - updated to use AuthUserType
         user_type = AuthUserType(
@@ -135,12 +142,12 @@ class Mutation:
         return LoginResult(
             success=True,
             message="Login successful",
-            tokens=TokenPair(access=access, refresh=refresh),
+            tokens=tokens,
             user=user_type
         )
     
     @strawberry.mutation
-    def refresh_token(self, info: Info, input: RefreshTokenInput) -> RefreshTokenResult:
+    async def refresh_token(self, info: Info, input: RefreshTokenInput) -> RefreshTokenResult:
         """
         Refresh an access token using a valid refresh token.
         
@@ -152,37 +159,40 @@ class Mutation:
             RefreshTokenResult containing success status, message, and new tokens if successful
         """
         try:
-            refresh = RefreshToken(input.refresh_token)
+            # Token verification checks the blacklist table
+            refresh = await sync_to_async(RefreshToken)(input.refresh_token)
             
             # Get new tokens
             access_token = str(refresh.access_token)
             
-            # If ROTATE_REFRESH_TOKENS is True, we'll get a new refresh token
-            if hasattr(refresh, 'get_token_backend'):
-                if settings.SIMPLE_JWT.get('ROTATE_REFRESH_TOKENS', False):
-                    refresh.set_jti()
-                    refresh.set_exp()
-                    refresh.set_iat()
-                    
-            refresh_token = str(refresh)
-            
-            # Create token objects
-            access = JWTToken(token=access_token, token_type="access")
-            refresh = JWTToken(token=refresh_token, token_type="refresh")
+            # Only rotation produces a new refresh token; otherwise hand back
+            # the one we were given instead of re-signing an identical token
+            if ROTATE_REFRESH_TOKENS:
+                refresh.set_jti()
+                refresh.set_exp()
+                refresh.set_iat()
+                refresh_token = str(refresh)
+            else:
+                refresh_token = input.refresh_token
             
             return RefreshTokenResult(
                 success=True,
                 message="Token refreshed successfully",
-                tokens=TokenPair(access=access, refresh=refresh)
+                tokens=TokenPair(
+                    access=JWTToken(token=access_token, token_type="access"),
+                    refresh=JWTToken(token=refresh_token, token_type="refresh")
+                )
             )
-        except Exception as e:
+        except (TokenError, InvalidToken) as e:
+            # Database errors are left to propagate so they reach the error logs
+            logger.warning("Token refresh failed", exc_info=e)
             return RefreshTokenResult(
                 success=False,
-                message=f"Token refresh failed: {str(e)}"
+                message="Token refresh failed: token is invalid, expired or blacklisted"
             )
     
     @strawberry.mutation
-    def logout(self, info: Info, input: LogoutInput) -> LogoutResult:
+    async def logout(self, info: Info, input: LogoutInput) -> LogoutResult:
         """
         Logout a user by blacklisting their refresh token.
         
@@ -195,19 +205,20 @@ class Mutation:
         """
         try:
             # Parse the token
-            token = RefreshToken(input.refresh_token)
+            token = await sync_to_async(RefreshToken)(input.refresh_token)
             
             # Blacklist the token
-            token.blacklist()
+            await sync_to_async(token.blacklist)()
             
             return LogoutResult(
                 success=True,
                 message="Logout successful"
             )
-        except Exception as e:
+        except (TokenError, InvalidToken) as e:
+            logger.warning("Logout failed", exc_info=e)
             return LogoutResult(
                 success=False,
-                message=f"Logout failed: {str(e)}"
+                message="Logout failed: token is invalid, expired or blacklisted"
             )
 
 
@@ -0,0 +1,77 @@
+"""
+Short-lived cache of verified JWT access tokens.
+
+Clients send the same access token on every GraphQL request, so verifying its
+signature and claims each time repeats identical work. This module keeps the
+validated token for a few seconds, keyed by a SHA-256 of the raw token.
+Only successfully verified tokens are stored and an entry is never returned
+after the token's own expiry.
+
+The TTL is read from the JWT_VERIFICATION_CACHE_TTL setting (seconds,
+default 10); set it to 0 to disable the cache.
+"""
+import hashlib
+import threading
+import time
+from typing import Optional, Union
+
+from cachetools import TTLCache
+from django.conf import settings
+from rest_framework_simplejwt.tokens import Token
+
+CACHE_TTL = getattr(settings, 'JWT_VERIFICATION_CACHE_TTL', 10)
+CACHE_MAX_SIZE = 10_000
+
+_cache = TTLCache(maxsize=CACHE_MAX_SIZE, ttl=CACHE_TTL) if CACHE_TTL > 0 else None
+_lock = threading.Lock()
+
+
+def _key(raw_token: Union[bytes, str]) -> bytes:
+    if isinstance(raw_token, str):
+        raw_token = raw_token.encode()
+    return hashlib.sha256(raw_token).digest()
+
+
+def get(raw_token: Union[bytes, str]) -> Optional[Token]:
+    """
+    Return the cached validated token for a raw token, if still valid.
+
+    Args:
+        raw_token: The raw JWT as taken from the Authorization header
+
+    Returns:
+        The validated token, or None on a miss or if the token has expired
+    """
+    if _cache is None:
+        return None
+
+    with _lock:
+        token = _cache.get(_key(raw_token))
+
+    if token is None or token.get('exp', 0) <= time.time():
+        return None
+    return token
+
+
+def set(raw_token: Union[bytes, str], token: Token) -> None:
+    """
+    Store a token that has just passed verification.
+
+    Args:
+        raw_token: The raw JWT as taken from the Authorization header
+        token: The validated token
+    """
+    if _cache is None:
+        return
+
+    with _lock:
+        _cache[_key(raw_token)] = token
+
+
+def clear() -> None:
+    """Drop all cached tokens."""
+    if _cache is None:
+        return
+
+    with _lock:
+        _cache.clear()
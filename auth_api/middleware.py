@@ -10,12 +10,18 @@ for other GraphQL implementations as needed.
 """
 from typing import Any, Optional, Callable, Dict
 
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
 from django.contrib.auth.models import AnonymousUser
 from django.http import HttpRequest
-from rest_framework_simplejwt.authentication import JWTAuthentication
-from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.exceptions import TokenError
 from strawberry.django.context import StrawberryDjangoContext
 
+from auth_api.authentication import GraphQLJWTAuthentication
+from users.models import UserRole
+
+_ADMIN_ROLE = UserRole.ADMIN
+
 
 class JWTAuthMiddleware:
     """
@@ -23,7 +29,13 @@ class JWTAuthMiddleware:
     
     This middleware extracts the JWT token from the Authorization header,
     verifies it using djangorestframework-simplejwt, and authenticates
-    the user for the GraphQL context.
+    the user for the GraphQL context. It also stores ``_is_authenticated``
+    and ``_is_admin`` on the request so permission checks do not repeat
+    the lookup for every protected field.
+    
+    Like Django's own middleware, it adapts to the view it wraps: around an
+    async view (e.g. AsyncGraphQLView) it is itself async and runs the token
+    check and user lookup in a worker thread.
     
     Usage:
         # In your GraphQL view configuration
@@ -46,7 +58,9 @@ class JWTAuthMiddleware:
             get_context: Function that builds the context for GraphQL requests
         """
         self.get_context = get_context
-        self.jwt_auth = JWTAuthentication()
+        self.jwt_auth = GraphQLJWTAuthentication()
+        if iscoroutinefunction(get_context):
+            markcoroutinefunction(self)
     
     def __call__(self, request: HttpRequest, context_value: Optional[Dict[str, Any]] = None, **kwargs) -> StrawberryDjangoContext:
         """
@@ -60,28 +74,10 @@ class JWTAuthMiddleware:
         Returns:
             StrawberryDjangoContext: The GraphQL context with authenticated user
         """
-        # Ensure the user is set to AnonymousUser by default
-        if not hasattr(request, 'user') or request.user is None:
-            request.user = AnonymousUser()
+        if iscoroutinefunction(self):
+            return self.__acall__(request, context_value, **kwargs)
         
-        # Try to authenticate with JWT token
-        if 'HTTP_AUTHORIZATION' in request.META:
-            try:
-                # Extract and verify the token
-                validated_token = self.get_validated_token(request)
-                if validated_token:
-                    # Get the user from the validated token
-                    # Handle both tuple return (user, auth) or direct user return
-                    user_auth = self.jwt_auth.get_user(validated_token)
-                    if isinstance(user_auth, tuple):
-                        # If it returns a tuple (user, auth) as per documentation
-                        request.user = user_auth[0]
-                    else:
-                        # If it directly returns the user object
-                        request.user = user_auth
-            except (InvalidToken, TokenError):
-                # If token is invalid, keep the user as AnonymousUser
-                pass
+        self.authenticate(request)
         
         # Build and return the context
         context_kwargs = context_value or {}
@@ -92,26 +88,38 @@ class JWTAuthMiddleware:
             context = self.get_context(request, context_kwargs)
         return context
     
-    def get_validated_token(self, request: HttpRequest) -> Optional[Any]:
+    async def __acall__(self, request: HttpRequest, context_value: Optional[Dict[str, Any]] = None, **kwargs) -> StrawberryDjangoContext:
+        """
+        Async counterpart of __call__, used when wrapping an async view.
+        """
+        await sync_to_async(self.authenticate)(request)
+        
+        context_kwargs = context_value or {}
+        if 'response' in kwargs:
+            return await self.get_context(request, context_kwargs, response=kwargs['response'])
+        return await self.get_context(request, context_kwargs)
+    
+    def authenticate(self, request: HttpRequest) -> None:
         """
-        Extract and validate the JWT token from the request.
+        Set request.user from the JWT token and resolve the permission flags.
         
         Args:
             request: The HTTP request
-            
-        Returns:
-            Optional[Any]: The validated token or None if validation fails
-            
-        Raises:
-            InvalidToken: If the token is invalid
-            TokenError: If there's an error processing the token
         """
-        auth_header = request.META.get('HTTP_AUTHORIZATION', '')
-        if not auth_header.startswith('Bearer '):
-            return None
+        # Authenticate with the JWT token, if any. authenticate() parses the
+        # Authorization header itself and returns None when there is no Bearer token.
+        try:
+            user_auth = self.jwt_auth.authenticate(request)
+        except (AuthenticationFailed, TokenError):
+            # Invalid token or unknown user, keep whatever user the request already has
+            user_auth = None
         
-        # Extract the raw token
-        raw_token = auth_header.split(' ')[1]
+        if user_auth is not None:
+            request.user = user_auth[0]
+        elif getattr(request, 'user', None) is None:
+            # Test requests may not have gone through AuthenticationMiddleware
+            request.user = AnonymousUser()
         
-        # Validate the token
-        return self.jwt_auth.get_validated_token(raw_token)
+        # Resolve the permission flags once per request
+        request._is_authenticated = request.user.pk is not None
+        request._is_admin = getattr(request.user, 'role', None) == _ADMIN_ROLE
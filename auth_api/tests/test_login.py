@@ -4,61 +4,67 @@ Tests for the login functionality in the auth_api app.
 This module contains tests for the JWT-based authentication system,
 specifically focusing on the login mutation and token validation.
 """
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 
-from users.tests.utils import GraphQLTestClient, GraphQLResponse
+from users.tests.utils import GraphQLTestClient
 from users.models import UserRole, User
 
+# Sent verbatim by every test, so the server parses and validates it only once
+LOGIN_MUTATION = '''
+    mutation Login($input: LoginInput!) {
+        login(input: $input) {
+            success
+            message
+            tokens {
+                access { token }
+                refresh { token }
+            }
+            user {
+                id
+                username
+            }
+        }
+    }
+'''
+
 
+# The production hasher is deliberately slow; these tests only need a working one
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
 class LoginMutationTests(TestCase):
     """Test suite for the login mutation."""
     
-    def setUp(self):
-        """Set up test data."""
+    @classmethod
+    def setUpTestData(cls):
+        """Create the users once for the whole class; each test runs in a rolled back transaction."""
         # Create a regular test user
-        self.test_user = User.objects.create_user(
+        cls.test_user = User.objects.create_user(
             username='testuser',
             email='test@example.com',
             password='testpassword123'
         )
         
         # Create an admin user
-        self.admin_user = User.objects.create_user(
+        cls.admin_user = User.objects.create_user(
             username='adminuser',
             email='admin@example.com',
-            password='adminpassword123'
+            password='adminpassword123',
+            role=UserRole.ADMIN
         )
-        self.admin_user.role = UserRole.ADMIN
-        self.admin_user.save()
         
         # Create an inactive user
-        self.inactive_user = User.objects.create_user(
+        cls.inactive_user = User.objects.create_user(
             username='inactiveuser',
             email='inactive@example.com',
             password='inactivepassword123',
             is_active=False
         )
-        
-        # Initialize the GraphQL client
+    
+    def setUp(self):
+        """Set up a fresh GraphQL client for each test."""
         self.client = GraphQLTestClient()
-        
-        # Login mutation
-        self.login_mutation = '''
-            mutation Login($input: LoginInput!) {
-                login(input: $input) {
-                    success
-                    message
-                    tokens {
-                        access { token }
-                        refresh { token }
-                    }
-                    user {
-                        id
-                        username
-                    }
-                }
-            }
-        '''
+        self.login_mutation = LOGIN_MUTATION
     
     def test_successful_login(self):
         """Test successful login with valid credentials."""
@@ -69,7 +75,7 @@ class LoginMutationTests(TestCase):
             }
         }
         
-        response = GraphQLResponse(self.client.mutate(self.login_mutation, variables))
+        response = self.client.execute(self.login_mutation, variables)
         
         # Check the response structure
         self.assertFalse(response.has_errors)
@@ -92,7 +98,7 @@ class LoginMutationTests(TestCase):
             }
         }
         
-        response = GraphQLResponse(self.client.mutate(self.login_mutation, variables))
+        response = self.client.execute(self.login_mutation, variables)
         
         # Check the response structure
         self.assertFalse(response.has_errors)
@@ -111,7 +117,7 @@ class LoginMutationTests(TestCase):
             }
         '''
         
-        admin_response = GraphQLResponse(self.client.query(admin_query))
+        admin_response = self.client.execute(admin_query)
         # Admin should be able to access the users query
         self.assertFalse(admin_response.has_errors)
     
@@ -125,7 +131,7 @@ class LoginMutationTests(TestCase):
             }
         }
         
-        response = GraphQLResponse(self.client.mutate(self.login_mutation, variables))
+        response = self.client.execute(self.login_mutation, variables)
         
         self.assertFalse(response.has_errors)  # GraphQL operation succeeds but login fails
         self.assertFalse(response.get_field_value('login.success'))
@@ -140,7 +146,7 @@ class LoginMutationTests(TestCase):
             }
         }
         
-        response = GraphQLResponse(self.client.mutate(self.login_mutation, variables))
+        response = self.client.execute(self.login_mutation, variables)
         
         self.assertFalse(response.has_errors)
         self.assertFalse(response.get_field_value('login.success'))
@@ -156,7 +162,7 @@ class LoginMutationTests(TestCase):
             }
         }
         
-        response = GraphQLResponse(self.client.mutate(self.login_mutation, variables))
+        response = self.client.execute(self.login_mutation, variables)
         
         self.assertFalse(response.has_errors)
         self.assertFalse(response.get_field_value('login.success'))
@@ -173,7 +179,7 @@ class LoginMutationTests(TestCase):
             }
         }
         
-        login_response = GraphQLResponse(self.client.mutate(self.login_mutation, variables))
+        login_response = self.client.execute(self.login_mutation, variables)
         self.client.access_token = login_response.get_field_value('login.tokens.access.token')
         
         # Try to access the me query with the token
@@ -187,7 +193,7 @@ class LoginMutationTests(TestCase):
             }
         '''
         
-        me_response = GraphQLResponse(self.client.query(me_query))
+        me_response = self.client.execute(me_query)
         
         # Should succeed with valid token
         self.assertFalse(me_response.has_errors)
@@ -195,8 +201,33 @@ class LoginMutationTests(TestCase):
         
         # Clear authentication and try again
         self.client.clear_authentication()
-        me_response = GraphQLResponse(self.client.query(me_query))
+        me_response = self.client.execute(me_query)
         
         # Should fail without token
         self.assertTrue(me_response.has_errors)
         self.assertIn('User is not authenticated', me_response.get_first_error_message())
+    
+    def test_me_query_count(self):
+        """Test that the me query costs a fixed number of queries."""
+        self.client.authenticate(self.test_user)
+        me_query = '''
+            query {
+                me {
+                    id
+                    username
+                    email
+                    firstName
+                    lastName
+                    dateJoined
+                    isActive
+                }
+            }
+        '''
+        
+        with CaptureQueriesContext(connection) as ctx:
+            me_response = self.client.execute(me_query)
+        
+        self.assertFalse(me_response.has_errors)
+        self.assertEqual(me_response.get_field_value('me.username'), 'testuser')
+        # The JWT user lookup is the only query; me reuses request.user
+        self.assertEqual(len(ctx.captured_queries), 1)
@@ -1,3 +1,20 @@
 from django.contrib import admin
 
-# Register your models here.
+
+class ChangelistFieldsMixin:
+    """
+    ModelAdmin mixin that loads only ``changelist_fields`` on the changelist page.
+
+    The change form and other admin views still get every field. Include every
+    column that list_display, ordering and the model's __str__ read, otherwise
+    each row triggers a deferred-field query.
+    """
+    changelist_fields = ()
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        # Only narrow the changelist, the change form needs every field
+        match = request.resolver_match
+        if self.changelist_fields and match and match.url_name == f'{self.opts.app_label}_{self.opts.model_name}_changelist':
+            queryset = queryset.only(*self.changelist_fields)
+        return queryset
@@ -1,36 +1,76 @@
+import asyncio
+import hashlib
 import os
+import threading
+import weakref
+
+import httpx
 import requests
+from cachetools import TTLCache
 from django.conf import settings
 from django.contrib.gis.geos import Point
+from django.core.cache import cache
+from requests.adapters import HTTPAdapter
 from typing import Optional, Tuple, Dict, Any, Union, TypeVar
+from urllib3.util.retry import Retry
 
 import logging
 
 logger = logging.getLogger(__name__)
 
-def geocode_address(
-    street: Optional[str] = None,
-    zip_code: Optional[str] = None,
-    city: Optional[str] = None,
-    place_name: Optional[str] = None,
-    country_code: str = 'us'
-) -> Tuple[Optional[Point], Optional[Dict[str, Any]]]:
-    """
-    Geocode an address using the Mapbox Search Box API.
+# (connect, read) timeouts so a slow Mapbox response cannot pin a worker
+MAPBOX_TIMEOUT = (3.05, 10)
 
-    Args:
-        street: Street address
-        zip_code: ZIP/Postal code
-        city: City name
-        place_name: Name of the place
-        country_code: Two-letter country code (default: 'us')
+# Geocoding results keyed by the normalized (query, country) actually sent to Mapbox
+_GEOCODE_CACHE = TTLCache(maxsize=10_000, ttl=24 * 3600)
+_GEOCODE_CACHE_LOCK = threading.Lock()
 
-    Returns:
-        Tuple[Optional[Point], Optional[Dict[str, Any]]]: (Point object with lat/lon, raw response data) or (None, None) if geocoding fails
+# Second level shared by all workers through the Django cache (Redis when configured).
+# Addresses rarely move, so entries live much longer than in the in-process cache.
+GEOCODE_SHARED_CACHE_TTL = 30 * 24 * 3600
+GEOCODE_SHARED_CACHE_PREFIX = "geocode:"
+
+# Shared session so repeated geocoding reuses keep-alive TLS connections
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=50,
+    max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[429, 502, 503, 504]),
+))
+
+MAPBOX_FORWARD_URL = "https://api.mapbox.com/search/searchbox/v1/forward"
+
+# Resolved once; settings take precedence over the environment
+_MAPBOX_API_KEY = getattr(settings, 'MAPBOX_API_KEY', None) or os.environ.get('MAPBOX_API_KEY')
+
+# httpx.AsyncClient is bound to the loop it was first used on, so keep one per loop
+_ASYNC_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def _get_async_client() -> httpx.AsyncClient:
+    loop = asyncio.get_running_loop()
+    client = _ASYNC_CLIENTS.get(loop)
+    if client is None:
+        client = httpx.AsyncClient(
+            timeout=httpx.Timeout(MAPBOX_TIMEOUT[1], connect=MAPBOX_TIMEOUT[0]),
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=10),
+            transport=httpx.AsyncHTTPTransport(retries=3),
+        )
+        _ASYNC_CLIENTS[loop] = client
+    return client
+
+
+def _prepare_request(
+    place_name: Optional[str],
+    city: Optional[str],
+    country_code: str,
+) -> Tuple[Optional[Tuple[str, str]], Optional[Dict[str, Any]]]:
     """
-    # Get API key from settings or environment
-    api_key = getattr(settings, 'MAPBOX_API_KEY', os.environ.get('MAPBOX_API_KEY'))
+    Build the cache key and Mapbox query parameters for an address.
 
+    Returns (None, None) when there is nothing to geocode.
+    """
+    api_key = _MAPBOX_API_KEY
     if not api_key:
         raise ValueError("Mapbox API key not found. Please set MAPBOX_API_KEY in .env or settings.")
 
@@ -50,8 +90,8 @@ def geocode_address(
 
     query = ", ".join(address_parts)
 
-    # Make the API request to Search Box API
-    url = "https://api.mapbox.com/search/searchbox/v1/forward"
+    # Street and ZIP are not part of the query, so they are not part of the key either
+    cache_key = (" ".join(query.lower().split()), country_code.lower())
     params = {
         'access_token': api_key,
         'q': query,
@@ -60,28 +100,175 @@ def geocode_address(
         'types': 'address,poi,place',  # Include addresses, points of interest, and place names
         'language': 'en',  # Default language for results
     }
+    return cache_key, params
+
+
+def _get_cached(cache_key: Tuple[str, str]) -> Optional[Tuple[Optional[Point], Optional[Dict[str, Any]]]]:
+    with _GEOCODE_CACHE_LOCK:
+        cached = _GEOCODE_CACHE.get(cache_key)
+    if cached is None:
+        return None
+    point, data = cached
+    return (point.clone() if point else None), data
+
+
+def _shared_cache_key(cache_key: Tuple[str, str]) -> str:
+    return GEOCODE_SHARED_CACHE_PREFIX + hashlib.blake2b("|".join(cache_key).encode(), digest_size=16).hexdigest()
+
+
+# A shared cache outage only costs the Mapbox requests it would have saved,
+# so its errors are logged and never fail the lookup
+def _shared_cache_get(shared_key: str):
+    try:
+        return cache.get(shared_key)
+    except Exception:
+        logger.exception("Shared geocoding cache read failed")
+        return None
+
+
+async def _shared_cache_aget(shared_key: str):
+    try:
+        return await cache.aget(shared_key)
+    except Exception:
+        logger.exception("Shared geocoding cache read failed")
+        return None
+
+
+def _shared_cache_set(shared_key: str, entry) -> None:
+    try:
+        cache.set(shared_key, entry, GEOCODE_SHARED_CACHE_TTL)
+    except Exception:
+        logger.exception("Shared geocoding cache write failed")
+
+
+async def _shared_cache_aset(shared_key: str, entry) -> None:
+    try:
+        await cache.aset(shared_key, entry, GEOCODE_SHARED_CACHE_TTL)
+    except Exception:
+        logger.exception("Shared geocoding cache write failed")
+
+
+def _to_shared_entry(point: Optional[Point], data: Dict[str, Any]) -> Tuple[Optional[Tuple[float, float]], Dict[str, Any]]:
+    # Plain coordinates pickle smaller and safer than GEOS objects
+    return ((point.x, point.y) if point else None), data
+
+
+def _from_shared_entry(cache_key: Tuple[str, str], entry) -> Tuple[Optional[Point], Dict[str, Any]]:
+    coords, data = entry
+    point = Point(*coords) if coords else None
+    with _GEOCODE_CACHE_LOCK:
+        _GEOCODE_CACHE[cache_key] = (point.clone() if point else None, data)
+    return point, data
+
+
+def _parse_and_cache(cache_key: Tuple[str, str], data: Dict[str, Any]) -> Tuple[Optional[Point], Dict[str, Any]]:
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Geocoding response: %r", data)
+    # Check if we got any results
+    if not data.get('features'):
+        with _GEOCODE_CACHE_LOCK:
+            _GEOCODE_CACHE[cache_key] = (None, data)
+        return None, data
+
+    # Get the coordinates (Mapbox Search Box returns [longitude, latitude] in coordinates)
+    feature = data['features'][0]
+    lon, lat = feature['geometry']['coordinates']
+
+    # Create a Point object
+    point = Point(lon, lat)
+
+    with _GEOCODE_CACHE_LOCK:
+        _GEOCODE_CACHE[cache_key] = (point.clone(), data)
+    return point, data
+
+
+def geocode_address(
+    street: Optional[str] = None,
+    zip_code: Optional[str] = None,
+    city: Optional[str] = None,
+    place_name: Optional[str] = None,
+    country_code: str = 'us'
+) -> Tuple[Optional[Point], Optional[Dict[str, Any]]]:
+    """
+    Geocode an address using the Mapbox Search Box API.
+
+    Args:
+        street: Street address
+        zip_code: ZIP/Postal code
+        city: City name
+        place_name: Name of the place
+        country_code: Two-letter country code (default: 'us')
+
+    Returns:
+        Tuple[Optional[Point], Optional[Dict[str, Any]]]: (Point object with lat/lon, raw response data) or (None, None) if geocoding fails
+
+    Successful lookups are cached in-process for 24 hours and in the Django cache
+    for 30 days; failed requests are not cached.
+    """
+    cache_key, params = _prepare_request(place_name, city, country_code)
+    if cache_key is None:
+        return None, None
+
+    cached = _get_cached(cache_key)
+    if cached is not None:
+        return cached
+
+    shared_key = _shared_cache_key(cache_key)
+    entry = _shared_cache_get(shared_key)
+    if entry is not None:
+        return _from_shared_entry(cache_key, entry)
 
     try:
-        logger.info(f"Geocoding request: {url} with params: {params}")
-        response = requests.get(url, params=params)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Geocoding request: %s with params: %s", MAPBOX_FORWARD_URL, {**params, 'access_token': '***'})
+        response = _SESSION.get(MAPBOX_FORWARD_URL, params=params, timeout=MAPBOX_TIMEOUT)
         response.raise_for_status()  # Raise exception for HTTP errors
+        point, data = _parse_and_cache(cache_key, response.json())
+        _shared_cache_set(shared_key, _to_shared_entry(point, data))
+        return point, data
 
-        data = response.json()
-        logger.info(f"Geocoding response: {data}")
-        # Check if we got any results
-        if not data.get('features'):
-            return None, data
+    except Exception:
+        # exception() records the traceback, including the error message
+        logger.exception("Geocoding error")
+        return None, None
 
-        # Get the coordinates (Mapbox Search Box returns [longitude, latitude] in coordinates)
-        feature = data['features'][0]
-        lon, lat = feature['geometry']['coordinates']
 
-        # Create a Point object
-        point = Point(lon, lat)
+async def ageocode_address(
+    street: Optional[str] = None,
+    zip_code: Optional[str] = None,
+    city: Optional[str] = None,
+    place_name: Optional[str] = None,
+    country_code: str = 'us'
+) -> Tuple[Optional[Point], Optional[Dict[str, Any]]]:
+    """
+    Async version of geocode_address for use from async views and resolvers.
 
+    Uses a pooled httpx.AsyncClient so the event loop keeps serving other
+    requests while Mapbox responds. Shares the result cache with geocode_address.
+    """
+    cache_key, params = _prepare_request(place_name, city, country_code)
+    if cache_key is None:
+        return None, None
+
+    cached = _get_cached(cache_key)
+    if cached is not None:
+        return cached
+
+    shared_key = _shared_cache_key(cache_key)
+    entry = await _shared_cache_aget(shared_key)
+    if entry is not None:
+        return _from_shared_entry(cache_key, entry)
+
+    try:
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Geocoding request: %s with params: %s", MAPBOX_FORWARD_URL, {**params, 'access_token': '***'})
+        response = await _get_async_client().get(MAPBOX_FORWARD_URL, params=params)
+        response.raise_for_status()  # Raise exception for HTTP errors
+        point, data = _parse_and_cache(cache_key, response.json())
+        await _shared_cache_aset(shared_key, _to_shared_entry(point, data))
         return point, data
 
-    except Exception as e:
-        # Log the error
-        logger.exception(f"Geocoding error: {str(e)}")
+    except Exception:
+        # exception() records the traceback, including the error message
+        logger.exception("Geocoding error")
         return None, None
@@ -14,9 +14,29 @@ class CreatedUpdatedModel(models.Model):
     class YourModel(CreatedUpdatedModel):
         # Your fields here
         pass
+
+    For bulk ingest use bulk_create_with_timestamps() instead of calling save()
+    on each object.
     """
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         abstract = True
+
+    @classmethod
+    def bulk_create_with_timestamps(cls, objs, batch_size=1000):
+        """
+        Insert objects in batches instead of one save() per object.
+
+        bulk_create still runs each field's pre_save(), so created_at and
+        updated_at are filled in exactly as save() would fill them.
+
+        Args:
+            objs: Unsaved model instances
+            batch_size: Number of rows per INSERT statement
+
+        Returns:
+            The list of created objects, as returned by bulk_create
+        """
+        return cls.objects.bulk_create(objs, batch_size=batch_size)
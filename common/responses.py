@@ -0,0 +1,18 @@
+import orjson
+from django.http import HttpResponse
+
+
+class OrjsonResponse(HttpResponse):
+    """
+    Drop-in replacement for JsonResponse that serializes with orjson.
+
+    orjson encodes straight to bytes and is several times faster than json.dumps
+    on the nested AI payloads the admin views return. Like JsonResponse with
+    safe=True, data must be a dict.
+    """
+
+    def __init__(self, data, **kwargs):
+        if not isinstance(data, dict):
+            raise TypeError("In order to allow non-dict objects to be serialized set the safe parameter to False.")
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(content=orjson.dumps(data), **kwargs)
@@ -2,6 +2,11 @@
 ASGI config for family_map project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+The GraphQL endpoint is async, so serve it through an ASGI server, e.g.
+``WEB_CONCURRENCY=4 uvicorn family_map.asgi:application`` (uvicorn takes its
+worker count from WEB_CONCURRENCY). Several workers need a shared cache
+(REDIS_URL); with WEB_CONCURRENCY > 1 the app refuses to start without one,
+see scraping.tasks.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -1,4 +1,8 @@
+import functools
+
 import strawberry
+from strawberry.extensions import ParserCache, ValidationCache
+from strawberry.schema.config import StrawberryConfig
 from strawberry.tools import merge_types
 
 # Import schemas from apps
@@ -13,9 +17,19 @@ Query = merge_types("Query", (UsersQuery, AuthQuery))
 # Merge mutations from all apps
 Mutation = merge_types("Mutation", (UsersMutation, AuthMutation))
 
-# Create the main schema
-schema = strawberry.Schema(
-    query=Query,
-    mutation=Mutation
 
-)
+@functools.lru_cache(maxsize=1)
+def get_schema() -> strawberry.Schema:
+    """Build the main schema once per process; later calls return the same instance."""
+    return strawberry.Schema(
+        query=Query,
+        mutation=Mutation,
+        config=StrawberryConfig(auto_camel_case=True),
+        # Clients send the same few operation documents over and over, so
+        # parse and validate each distinct document only once
+        extensions=[ParserCache(maxsize=256), ValidationCache(maxsize=256)],
+    )
+
+
+# Create the main schema
+schema = get_schema()
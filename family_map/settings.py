@@ -117,6 +117,8 @@ WSGI_APPLICATION = 'family_map.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+DB_PGBOUNCER = os.getenv('DB_PGBOUNCER', 'False').lower() == 'true'
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.contrib.gis.db.backends.postgis',
@@ -125,9 +127,52 @@ DATABASES = {
         'PASSWORD': os.getenv('DB_PASSWORD'),
         'HOST': os.getenv('DB_HOST'),
         'PORT': os.getenv('DB_PORT'),
+        # Keep connections open between requests instead of reconnecting each time
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': True,
+        # Behind PgBouncer in transaction pooling mode server-side cursors and
+        # prepared statements do not survive across transactions
+        'DISABLE_SERVER_SIDE_CURSORS': DB_PGBOUNCER,
+        'OPTIONS': {
+            # psycopg only prepares statements with server-side binding; the
+            # default client-side binding cursors never do
+            'server_side_binding': not DB_PGBOUNCER,
+            'prepare_threshold': None if DB_PGBOUNCER else 5,
+        },
     }
 }
 
+# Tests run in parallel workers, each on its own test database clone
+TEST_RUNNER = 'family_map.test_runner.FamilyMapTestRunner'
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Redis is used when REDIS_URL is set so cached entries survive restarts and
+# are shared between workers; otherwise fall back to the per-process cache.
+REDIS_URL = os.getenv('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Refuse to start without a shared cache, since the admin's background tasks
+# (scraping.tasks) are polled from whichever worker gets the request. On by
+# default when WEB_CONCURRENCY asks uvicorn or gunicorn for several workers.
+SCRAPING_TASKS_REQUIRE_SHARED_CACHE = os.getenv(
+    'SCRAPING_TASKS_REQUIRE_SHARED_CACHE', str(int(os.getenv('WEB_CONCURRENCY', 1)) > 1)
+).lower() == 'true'
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -147,6 +192,12 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Throwaway environments (CI, local runs of users/examples/jwt_example.py) can
+# opt into a fast hasher; PBKDF2 dominates the cost of creating and logging in
+# short-lived users. Never enable this where real passwords are stored.
+if os.getenv('FAST_PASSWORD_HASHER', 'False').lower() == 'true':
+    PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
@@ -207,6 +258,14 @@ SIMPLE_JWT = {
     'TOKEN_TYPE_CLAIM': 'token_type',
 }
 
+# Seconds a verified access token is reused without re-checking its signature
+# (auth_api.jwt_cache); 0 disables the cache
+JWT_VERIFICATION_CACHE_TTL = int(os.getenv('JWT_VERIFICATION_CACHE_TTL', 10))
+
+# Seconds a user loaded by the user(id) query stays in the shared cache
+# (users.user_cache); 0 disables the cache
+USER_CACHE_TTL = int(os.getenv('USER_CACHE_TTL', 60))
+
 # Mapbox API settings
 MAPBOX_API_KEY = os.getenv('MAPBOX_API_KEY')
 MAP_WIDGETS = {
@@ -0,0 +1,23 @@
+import os
+
+from django.test.runner import DiscoverRunner, get_max_test_processes
+
+
+class FamilyMapTestRunner(DiscoverRunner):
+    """
+    DiscoverRunner that runs test classes in parallel by default.
+
+    Without --parallel, the suite is split by TestCase class across
+    get_max_test_processes() workers (override with DJANGO_TEST_PROCESSES).
+    Each worker runs against its own clone of the test database, which is
+    migrated once. Pass --parallel 1 to run serially, e.g. with --pdb.
+
+    Set DJANGO_TEST_KEEPDB=true to reuse the test databases between runs, as
+    --keepdb does: only new migrations are applied instead of building the
+    PostGIS schema from scratch. Drop it (or run once without) after
+    changing migrations in place.
+    """
+
+    def __init__(self, parallel=0, keepdb=False, **kwargs):
+        keepdb = keepdb or os.getenv('DJANGO_TEST_KEEPDB', 'False').lower() == 'true'
+        super().__init__(parallel=parallel or get_max_test_processes(), keepdb=keepdb, **kwargs)
@@ -0,0 +1,103 @@
+from dataclasses import dataclass, field
+
+from django.http import HttpRequest, HttpResponse
+from django.http.response import HttpResponseBase
+from django.utils.cache import patch_cache_control
+from django.views.static import serve
+from strawberry.dataloader import DataLoader
+from strawberry.django.context import StrawberryDjangoContext
+from strawberry.django.views import AsyncGraphQLView
+from strawberry.http.exceptions import HTTPException
+from strawberry.schema.exceptions import InvalidOperationTypeError
+from strawberry.types.graphql import OperationType
+
+from users.loaders import create_user_loader
+
+
+@dataclass
+class FamilyMapContext(StrawberryDjangoContext):
+    """GraphQL context carrying the per-request DataLoaders."""
+    user_loader: DataLoader = field(default_factory=create_user_loader)
+
+
+# Operations accepted in one batched request (a JSON array body)
+GRAPHQL_MAX_BATCH_OPERATIONS = 10
+
+
+class FamilyMapGraphQLView(AsyncGraphQLView):
+    async def get_context(self, request: HttpRequest, response: HttpResponse) -> FamilyMapContext:
+        return FamilyMapContext(request=request, response=response)
+
+    async def dispatch(self, request: HttpRequest, *args, **kwargs) -> HttpResponseBase:
+        # A JSON array body carries several operations; anything else is a single one
+        if (
+            request.method == 'POST'
+            and request.content_type == 'application/json'
+            and request.body.lstrip()[:1] == b'['
+        ):
+            return await self.run_batch(request)
+        return await super().dispatch(request, *args, **kwargs)
+
+    async def run_batch(self, request: HttpRequest) -> HttpResponseBase:
+        """
+        Execute a batch of operations in order and answer with one result per operation.
+
+        All operations share one context, so the DataLoaders batch across them as well.
+        """
+        try:
+            operations = self.parse_json(request.body)
+        except HTTPException as e:
+            return HttpResponse(content=e.reason, status=e.status_code)
+
+        if not 0 < len(operations) <= GRAPHQL_MAX_BATCH_OPERATIONS:
+            return HttpResponse(
+                content=f"A batch must contain between 1 and {GRAPHQL_MAX_BATCH_OPERATIONS} operations",
+                status=400,
+            )
+
+        sub_response = await self.get_sub_response(request)
+        context = await self.get_context(request, response=sub_response)
+        root_value = await self.get_root_value(request)
+
+        results = []
+        for operation in operations:
+            if not isinstance(operation, dict) or not operation.get('query'):
+                results.append({'data': None, 'errors': [{'message': 'No GraphQL query found in the operation'}]})
+                continue
+
+            try:
+                result = await self.schema.execute(
+                    operation['query'],
+                    root_value=root_value,
+                    variable_values=operation.get('variables'),
+                    context_value=context,
+                    operation_name=operation.get('operationName'),
+                    allowed_operation_types={OperationType.QUERY, OperationType.MUTATION},
+                    operation_extensions=operation.get('extensions'),
+                )
+            except InvalidOperationTypeError as e:
+                results.append({'data': None, 'errors': [{'message': e.as_http_error_reason('a batch')}]})
+                continue
+
+            response_data = await self.process_result(request=request, result=result)
+            if result.errors:
+                self._handle_errors(result.errors, response_data)
+            results.append(response_data)
+
+        return self.create_response(response_data=results, sub_response=sub_response)
+
+
+# Browser cache lifetime for media served by Django in DEBUG
+MEDIA_CACHE_MAX_AGE = 60
+
+
+def serve_media(request: HttpRequest, path: str, document_root: str = None, show_indexes: bool = False) -> HttpResponse:
+    """
+    Development media view: django.views.static.serve plus a short Cache-Control.
+
+    serve() already sends Last-Modified and answers If-Modified-Since with 304.
+    In production media should be served by the web server or object storage.
+    """
+    response = serve(request, path, document_root=document_root, show_indexes=show_indexes)
+    patch_cache_control(response, public=True, max_age=MEDIA_CACHE_MAX_AGE)
+    return response
@@ -3,12 +3,13 @@ from django.contrib.gis.geos import Point
 from django import forms
 from mapwidgets.widgets import MapboxPointFieldStaticWidget
 
+from common.admin import ChangelistFieldsMixin
 from place.models import Place
 
 
 class PlaceAdminForm(forms.ModelForm):
-    lat = forms.CharField(required=False, help_text='Latitude coordinate')
-    lon = forms.CharField(required=False, help_text='Longitude coordinate')
+    lat = forms.FloatField(required=False, min_value=-90, max_value=90, help_text='Latitude coordinate')
+    lon = forms.FloatField(required=False, min_value=-180, max_value=180, help_text='Longitude coordinate')
 
     class Meta:
         model = Place
@@ -23,22 +24,26 @@ class PlaceAdminForm(forms.ModelForm):
             self.fields['lat'].initial = self.instance.location.y
             self.fields['lon'].initial = self.instance.location.x
 
+    def clean(self):
+        cleaned_data = super().clean()
+        lat = cleaned_data.get('lat')
+        lon = cleaned_data.get('lon')
+
+        # Only rebuild the point when the coordinates were actually edited
+        if lat is not None and lon is not None and ('lat' in self.changed_data or 'lon' in self.changed_data):
+            cleaned_data['location'] = Point(lon, lat, srid=4326)
+        return cleaned_data
+
 
 @admin.register(Place)
-class PlaceAdmin(admin.ModelAdmin):
+class PlaceAdmin(ChangelistFieldsMixin, admin.ModelAdmin):
     form = PlaceAdminForm
-    list_display = ('name', 'location', 'created_at', 'updated_at')
+    list_display = ('name', 'latitude', 'longitude', 'created_at', 'updated_at')
     readonly_fields = ('created_at', 'updated_at')
+    list_per_page = 50
+    # Skip the unfiltered COUNT(*) on every changelist page
+    show_full_result_count = False
 
-    def save_model(self, request, obj, form, change):
-        lat = form.cleaned_data.get('lat')
-        lon = form.cleaned_data.get('lon')
-
-        if lat and lon:
-            try:
-                obj.location = Point(float(lon), float(lat))
-            except (ValueError, TypeError):
-                # If conversion fails, keep the existing location
-                pass
-
-        super().save_model(request, obj, form, change)
+    # Columns the changelist reads, plus scraped_id for the delete signals; the
+    # text and address fields are left out
+    changelist_fields = ('id', 'name', 'scraped_id', 'latitude', 'longitude', 'created_at', 'updated_at')
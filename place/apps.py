@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class PlaceConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'place'
+
+    def ready(self):
+        """
+        Connect signals when the app is ready.
+        """
+        import place.signals  # noqa: F401
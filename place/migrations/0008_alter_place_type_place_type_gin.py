@@ -0,0 +1,24 @@
+# Generated by Django 5.2.1 on 2025-07-14 09:12
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('place', '0007_rename_scraped_id_2_place_scraped_id'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='place',
+            name='type',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.CharField(choices=[('PLAYGROUND', 'Playground'), ('INDOOR_PLAYGROUND', 'Indoor Playground'), ('KINDERGARTEN', 'Kindergarten'), ('CAFE', 'Cafe'), ('RESTAURANT', 'Restaurant'), ('SHOP', 'Shop'), ('AMUSEMENT_PARK', 'Amusement Park'), ('MUSEUM', 'Museum'), ('GALLERY', 'Gallery'), ('ZOO', 'Zoo'), ('AQUAPARK', 'Aquapark'), ('COMMUNITY_CENTER', 'Community Center'), ('KIDS_PLAYROOM', 'Kids Playroom'), ('CASTLE', 'Castle'), ('HOTEL', 'Hotel'), ('ATTRACTION', 'Attraction'), ('NATURAL_ATTRACTION', 'Natural Attraction')], max_length=255), default=list, size=None),
+        ),
+        migrations.AddIndex(
+            model_name='place',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['type'], name='place_type_gin'),
+        ),
+    ]
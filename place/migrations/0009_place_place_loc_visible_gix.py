@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2025-07-14 09:40
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('place', '0008_alter_place_type_place_type_gin'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='place',
+            index=django.contrib.postgres.indexes.GistIndex(condition=models.Q(('is_visible', True)), fields=['location'], name='place_loc_visible_gix'),
+        ),
+    ]
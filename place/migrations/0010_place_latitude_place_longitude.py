@@ -0,0 +1,24 @@
+# Generated by Django 5.2.1 on 2025-07-15 10:05
+
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('place', '0009_place_place_loc_visible_gix'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='place',
+            name='latitude',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.Func(models.F('location'), function='ST_Y', output_field=models.FloatField()), output_field=models.FloatField()),
+        ),
+        migrations.AddField(
+            model_name='place',
+            name='longitude',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.Func(models.F('location'), function='ST_X', output_field=models.FloatField()), output_field=models.FloatField()),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2025-07-15 11:20
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('place', '0010_place_latitude_place_longitude'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='place',
+            index=django.contrib.postgres.indexes.BrinIndex(fields=['created_at'], name='place_created_at_brin', pages_per_range=32),
+        ),
+    ]
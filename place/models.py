@@ -1,12 +1,30 @@
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import BrinIndex, GinIndex, GistIndex
 from django.db import models
 from django.contrib.gis.db import models as gis_models
-from django.db.models import OneToOneField, ForeignKey
+from django.contrib.gis.db.models.functions import Distance, GeometryDistance
+from django.db.models import OneToOneField, ForeignKey, Q, F, Func
 
 from common.models import CreatedUpdatedModel
 from scraping.models import ScrapedPlace, ScrapedPost
 
 
+class PlaceQuerySet(models.QuerySet):
+    def nearest(self, point, limit=10):
+        """
+        Visible places closest to point, nearest first.
+
+        Ordering by GeometryDistance compiles to ``ORDER BY location <-> point``,
+        which PostGIS answers with a KNN walk of place_loc_visible_gix; the
+        exact Distance is only annotated for the returned rows.
+        """
+        return (
+            self.filter(is_visible=True)
+            .annotate(distance=Distance('location', point))
+            .order_by(GeometryDistance('location', point))[:limit]
+        )
+
+
 class Place(CreatedUpdatedModel):
     class PlaceType(models.TextChoices):
         PLAYGROUND = "PLAYGROUND"
@@ -34,9 +52,20 @@ class Place(CreatedUpdatedModel):
 
     name = models.CharField(max_length=255, null=False, blank=False)
     scraped_id = ForeignKey(ScrapedPost, on_delete=models.SET_NULL, related_name='posts', null=True)
-    type = ArrayField(models.CharField(max_length=255, choices=PlaceType.choices), default=list,db_index=True)
+    type = ArrayField(models.CharField(max_length=255, choices=PlaceType.choices), default=list)
     description = models.TextField(null=True, blank=True)
     location = gis_models.PointField(null=False, blank=False)
+    # Derived from location by Postgres so listings can show coordinates without GEOS
+    latitude = models.GeneratedField(
+        expression=Func(F('location'), function='ST_Y', output_field=models.FloatField()),
+        output_field=models.FloatField(),
+        db_persist=True,
+    )
+    longitude = models.GeneratedField(
+        expression=Func(F('location'), function='ST_X', output_field=models.FloatField()),
+        output_field=models.FloatField(),
+        db_persist=True,
+    )
     country_code = models.CharField(max_length=255, null=False, blank=False)
     city = models.CharField(max_length=255, null=False, blank=False)
     street = models.CharField(max_length=255, null=True, blank=True)
@@ -50,3 +79,21 @@ class Place(CreatedUpdatedModel):
     is_visible = models.BooleanField(default=True,db_index=True)
     car_needed = models.BooleanField(default=True, null=True)
 
+    objects = PlaceQuerySet.as_manager()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Lets place.signals spot a move to another post without re-reading the row
+        instance._original_scraped_id = instance.__dict__.get('scraped_id_id', models.DEFERRED)
+        return instance
+
+    class Meta:
+        indexes = [
+            # Serves type__contains / type__overlap filters (@> / &&)
+            GinIndex(fields=['type'], name='place_type_gin'),
+            # PointField already has a full GiST index; this one only covers what the map shows
+            GistIndex(fields=['location'], condition=Q(is_visible=True), name='place_loc_visible_gix'),
+            # Rows are appended in created_at order, which is exactly what BRIN needs
+            BrinIndex(fields=['created_at'], pages_per_range=32, name='place_created_at_brin'),
+        ]
@@ -0,0 +1,51 @@
+"""
+Keep ScrapedPost.related_places_count in sync with the Places created from it.
+
+The counter is adjusted with F() expressions, so concurrent saves do not lose
+updates. The post a Place pointed to is remembered by Place.from_db and after
+each save, so a reassignment is detected without re-reading the row; a Place
+whose scraped_id was deferred, or that was built by hand with an existing pk,
+is not tracked on save. On delete the post is read before the row goes, and
+loaded if scraped_id was deferred (as on the admin changelist). bulk_create
+and queryset.update() bypass these signals; callers using them must adjust
+the counter themselves.
+"""
+from django.db.models import DEFERRED, F
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from place.models import Place
+from scraping.models import ScrapedPost
+
+
+def _adjust_related_places_count(post_id, delta):
+    if post_id is not None:
+        ScrapedPost.objects.filter(pk=post_id).update(related_places_count=F('related_places_count') + delta)
+
+
+@receiver(post_save, sender=Place)
+def update_related_places_count_on_save(sender, instance, created, **kwargs):
+    current = instance.__dict__.get('scraped_id_id', DEFERRED)
+    if created:
+        _adjust_related_places_count(current, 1)
+    else:
+        previous = getattr(instance, '_original_scraped_id', DEFERRED)
+        if previous is not DEFERRED and current is not DEFERRED and previous != current:
+            _adjust_related_places_count(previous, -1)
+            _adjust_related_places_count(current, 1)
+    instance._original_scraped_id = current
+
+
+@receiver(pre_delete, sender=Place)
+def remember_deleted_scraped_post(sender, instance, **kwargs):
+    """Record the post of a Place about to be deleted, while its row still exists."""
+    post_id = instance.__dict__.get('scraped_id_id', DEFERRED)
+    if post_id is DEFERRED:
+        # Loading the deferred field after the DELETE would find no row
+        post_id = Place.objects.filter(pk=instance.pk).values_list('scraped_id_id', flat=True).first()
+    instance._deleted_scraped_id = post_id
+
+
+@receiver(post_delete, sender=Place)
+def update_related_places_count_on_delete(sender, instance, **kwargs):
+    _adjust_related_places_count(getattr(instance, '_deleted_scraped_id', None), -1)
@@ -77,3 +77,29 @@ class CreatedUpdatedModelTest(TestCase):
             original_updated_at,
             "updated_at should change when object is updated"
         )
+    
+    def test_bulk_create_with_timestamps(self):
+        """Test that bulk-created objects get both timestamps set."""
+        places = Place.bulk_create_with_timestamps([
+            Place(
+                name=f"Bulk Place {i}",
+                location=Point(17.1077, 48.1486),
+                country_code="SK",
+                city="Bratislava"
+            )
+            for i in range(3)
+        ])
+        
+        self.assertEqual(len(places), 3)
+        
+        # Verify the rows were stored with timestamps set on insert
+        stored = Place.objects.filter(name__startswith="Bulk Place")
+        self.assertEqual(stored.count(), 3)
+        for place in stored:
+            self.assertIsNotNone(place.created_at)
+            self.assertIsNotNone(place.updated_at)
+            self.assertAlmostEqual(
+                place.created_at.timestamp(),
+                place.updated_at.timestamp(),
+                delta=0.1
+            )
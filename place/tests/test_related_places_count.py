@@ -0,0 +1,86 @@
+from django.contrib.gis.geos import Point
+from django.test import TestCase
+from django.utils import timezone
+
+from place.models import Place
+from scraping.models import ScrapedPost
+
+
+class RelatedPlacesCountTest(TestCase):
+    """Tests for keeping ScrapedPost.related_places_count in sync with its Places."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.post = self.create_post("1")
+        self.other_post = self.create_post("2")
+
+    def create_post(self, third_party_id):
+        return ScrapedPost.objects.create(
+            third_party_id=third_party_id,
+            third_party_type="test",
+            title=f"Post {third_party_id}",
+            content="",
+            comments=[],
+            probability=1.0,
+            original_created_at=timezone.now(),
+        )
+
+    def create_place(self, post):
+        return Place.objects.create(
+            name="Test Place",
+            scraped_id=post,
+            location=Point(14.4378, 50.0755),
+            country_code="CZ",
+            city="Prague",
+        )
+
+    def assertCount(self, post, expected):
+        post.refresh_from_db(fields=['related_places_count'])
+        self.assertEqual(post.related_places_count, expected)
+
+    def test_count_follows_create_and_delete(self):
+        """Test that creating and deleting places adjusts the counter."""
+        first = self.create_place(self.post)
+        self.create_place(self.post)
+        self.assertCount(self.post, 2)
+
+        first.delete()
+        self.assertCount(self.post, 1)
+
+    def test_count_follows_delete_of_deferred_places(self):
+        """Test that deleting places loaded without scraped_id still adjusts the counter."""
+        self.create_place(self.post)
+        self.create_place(self.post)
+
+        Place.objects.only('id').delete()
+
+        self.assertCount(self.post, 0)
+
+    def test_count_follows_reassignment(self):
+        """Test that moving a place to another post moves the count with it."""
+        place = self.create_place(self.post)
+
+        place.scraped_id = self.other_post
+        place.save()
+
+        self.assertCount(self.post, 0)
+        self.assertCount(self.other_post, 1)
+
+    def test_count_follows_reassignment_of_loaded_place(self):
+        """Test that a place read back from the database is tracked too."""
+        place = Place.objects.get(pk=self.create_place(self.post).pk)
+
+        place.scraped_id = self.other_post
+        place.save()
+
+        self.assertCount(self.post, 0)
+        self.assertCount(self.other_post, 1)
+
+    def test_plain_update_keeps_count(self):
+        """Test that saving a place without changing its post leaves the count alone."""
+        place = self.create_place(self.post)
+
+        place.name = "Renamed"
+        place.save()
+
+        self.assertCount(self.post, 1)
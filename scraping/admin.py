@@ -1,29 +1,136 @@
+import functools
 from json import JSONDecodeError
 
 from django.contrib import admin
 from django.urls import path
 from django.shortcuts import render, redirect, get_object_or_404
 from django.template.response import TemplateResponse
-from django.http import HttpResponseRedirect, JsonResponse
+from django.http import HttpResponseRedirect
 from django.urls import reverse
+from django.db import transaction
 from django.utils.html import format_html
 import json
+import orjson
 from django.contrib.gis.geos import Point
+from django.contrib.gis.measure import D
+from django.db.models import Q
 
 from ai.open_ai_client import OpenAIClient
 from ai.prompts import get_place_review_prompt
+from common.admin import ChangelistFieldsMixin
+from common.responses import OrjsonResponse
 from common.geocoding import geocode_address
+from . import tasks
 from .models import ScrapedPlace, ScrapedPost
 from place.models import Place
 import logging
 
 logger = logging.getLogger(__name__)
 
-class ScrapedPostAdmin(admin.ModelAdmin):
+
+@functools.lru_cache(maxsize=1)
+def _get_ai_client() -> OpenAIClient:
+    """One client for all admin requests, so its limiters and response cache are shared."""
+    return OpenAIClient(model="gpt-4.1")
+
+
+# Largest JSON body the review endpoints accept; real payloads are a few KB
+MAX_JSON_BODY_SIZE = 64 * 1024
+
+
+def _read_json_body(request):
+    """
+    Parse a JSON object request body, rejecting bad requests before any work.
+
+    Returns:
+        (data, None) on success, or (None, error response) when the body is too
+        large, not declared as JSON, empty, malformed or not an object
+    """
+    if int(request.META.get('CONTENT_LENGTH') or 0) > MAX_JSON_BODY_SIZE:
+        return None, OrjsonResponse({"error": "Payload too large"}, status=413)
+    if request.content_type != 'application/json':
+        return None, OrjsonResponse({"error": "Content-Type must be application/json"}, status=415)
+    if not request.body:
+        return None, OrjsonResponse({"error": "Empty request body"}, status=400)
+    try:
+        data = orjson.loads(request.body)
+    except orjson.JSONDecodeError:
+        return None, OrjsonResponse({"error": "Invalid JSON"}, status=400)
+    if not isinstance(data, dict):
+        return None, OrjsonResponse({"error": "Expected a JSON object"}, status=400)
+    return data, None
+
+
+# The argument-free admin URLs never change at runtime, so reverse them once
+@functools.lru_cache(maxsize=None)
+def _review_url() -> str:
+    return reverse('admin:scraping_scrapedpost_review')
+
+
+@functools.lru_cache(maxsize=None)
+def _changelist_url() -> str:
+    return reverse('admin:scraping_scrapedpost_changelist')
+
+
+def _ask_ai(text):
+    """
+    Ask OpenAI (with web search) about a place and attach matching existing Places.
+
+    Runs as a background task; raises on any failure.
+    """
+    system_prompt, user_prompt = get_place_review_prompt(
+        name=text,
+        city="",
+        types=[]
+    )
+
+    # Get response from OpenAI
+    response = _get_ai_client().get_websearch_response(user_prompt, True, system_message=system_prompt)
+
+    # Parse the response as JSON
+    try:
+        response_data = json.loads(response) if isinstance(response, str) else response
+    except JSONDecodeError:
+        logger.error(f"Error decoding JSON from response : {response}")
+        raise ValueError("Invalid JSON")
+    if not isinstance(response_data, dict):
+        raise ValueError("Invalid JSON")
+
+    # Find nearby and similarly-named places if lat and lon are available
+    nearby_places = []
+    similar_name_places = []
+
+    if 'lat' in response_data and 'lon' in response_data:
+        # Create a point from the lat and lon
+        point = Point(float(response_data['lon']), float(response_data['lat']))
+
+        # Find places within 200 meters
+        nearby_places = list(
+            Place.objects.filter(location__distance_lte=(point, D(m=200))).values('id', 'name', 'type', 'city')
+        )
+
+        # Find places with similar names
+        if 'name' in response_data and response_data['name']:
+            similar_name_places = list(
+                Place.objects.filter(
+                    Q(name__icontains=response_data['name']) |
+                    Q(name__icontains=text)
+                ).exclude(id__in=[p['id'] for p in nearby_places]).values('id', 'name', 'type', 'city')
+            )
+
+    # Add nearby and similar name places to the response
+    response_data['nearby_places'] = nearby_places
+    response_data['similar_name_places'] = similar_name_places
+    return response_data
+
+
+class ScrapedPostAdmin(ChangelistFieldsMixin, admin.ModelAdmin):
     list_display = ('title', 'third_party_type', 'probability','is_processed')
     search_fields = ('title', 'content')
     list_filter = ('is_processed',)
     ordering = ('title',)
+    # Leaves out content and comments, the large text columns
+    changelist_fields = ('id', 'title', 'third_party_type', 'probability', 'is_processed')
 
     def response_change(self, request, obj):
         """Add a review button to the response"""
@@ -38,7 +145,7 @@ class ScrapedPostAdmin(admin.ModelAdmin):
         extra_context = extra_context or {}
         extra_context['review_button_html'] = format_html(
             '<a href="{}" class="button">Review Places</a>',
-            reverse("admin:scraping_scrapedpost_review")
+            _review_url()
         )
         return super().changelist_view(request, extra_context=extra_context)
 
@@ -50,6 +157,7 @@ class ScrapedPostAdmin(admin.ModelAdmin):
             path('mark_processed/<int:post_id>/', self.admin_site.admin_view(self.mark_processed), name='scraping_scrapedpost_mark_processed'),
             path('ask_ai_from_selection/', self.admin_site.admin_view(self.ask_ai_from_selection), name='scraping_scrapedpost_ask_ai_from_selection'),
             path('ask_ai_from_input/', self.admin_site.admin_view(self.ask_ai_from_input), name='scraping_scrapedpost_ask_ai_from_input'),
+            path('ai_result/<str:task_id>/', self.admin_site.admin_view(self.ai_result), name='scraping_scrapedpost_ai_result'),
             path('save_as_place/<int:post_id>/', self.admin_site.admin_view(self.save_as_place), name='scraping_scrapedpost_save_as_place'),
             path('geocode/<int:place_id>/', self.admin_site.admin_view(self.geocode_place), name='scraping_scrapedpost_geocode'),
         ]
@@ -57,18 +165,23 @@ class ScrapedPostAdmin(admin.ModelAdmin):
 
     def review_view(self, request, place_id=None):
         """View to review ScrapedPlace entries one by one"""
+        # The template lists post.places twice; prefetch them so both reads share one query
+        posts = ScrapedPost.objects.prefetch_related('places')
         if place_id:
             # Get the specific ScrapedPlace
-            post = get_object_or_404(ScrapedPost, id=place_id)
+            post = get_object_or_404(posts, id=place_id)
         else:
             # Get the first unprocessed ScrapedPlace
-            post = ScrapedPost.objects.filter(is_processed=False).order_by("title").first()
+            post = posts.filter(is_processed=False).order_by("title").first()
             if not post:
                 self.message_user(request, "No unprocessed places found.")
-                return HttpResponseRedirect(reverse('admin:scraping_scrapedpost_changelist'))
+                return HttpResponseRedirect(_changelist_url())
 
-        # Get related places
-        related_places = Place.objects.filter(scraped_id=post)
+        # Get related places, only the columns the template shows. Most posts
+        # in the queue have none yet, which the counter tells us without a query.
+        related_places = []
+        if post.related_places_count:
+            related_places = Place.objects.filter(scraped_id=post).only('id', 'name', 'type', 'city')
 
         context = {
             'post': post,
@@ -85,185 +198,71 @@ class ScrapedPostAdmin(admin.ModelAdmin):
 
     def mark_processed(self, request, post_id):
         """Mark a ScrapedPlace as processed and redirect to the next one"""
-        post = get_object_or_404(ScrapedPost, id=post_id)
+        post = get_object_or_404(ScrapedPost.objects.only('id', 'title'), id=post_id)
         post.is_processed = True
-        post.save()
+        # updated_at is auto_now, so it is only refreshed when listed
+        post.save(update_fields=['is_processed', 'updated_at'])
 
         self.message_user(request, f"Post '{post.title}' marked as processed.")
-        return HttpResponseRedirect(reverse('admin:scraping_scrapedpost_review'))
+        return HttpResponseRedirect(_review_url())
 
     def ask_ai_from_selection(self, request):
+        """Start an AI lookup for the selected text; the result is polled from ai_result"""
+        data, error = _read_json_body(request)
+        if error:
+            return error
 
-        try:
-            # Get the selected text from the request
-            data = json.loads(request.body)
-            selected_text = data.get('selected_text', '')
-
-            if not selected_text:
-                return JsonResponse({"error": "No text selected"}, status=400)
+        selected_text = data.get('selected_text', '')
+        if not selected_text:
+            return OrjsonResponse({"error": "No text selected"}, status=400)
 
-            # Create OpenAI client
-            client = OpenAIClient(model="gpt-4.1")
-
-            logger.info(f"Getting AI response from selection {selected_text} ...")
-            prompt = get_place_review_prompt(
-                name=selected_text,
-                city="",
-                types=[]
-            )
-
-            # Get response from OpenAI
-            response = client.get_websearch_response(prompt, True)
-
-            # Parse the response as JSON
-            if isinstance(response, str):
-                response_data = json.loads(response)
-            else:
-                response_data = response
-
-            # Find nearby and similarly-named places if lat and lon are available
-            nearby_places = []
-            similar_name_places = []
-
-            if 'lat' in response_data and 'lon' in response_data:
-                # Create a point from the lat and lon
-                point = Point(float(response_data['lon']), float(response_data['lat']))
-
-                # Find places within 200 meters
-                from django.contrib.gis.measure import D
-                nearby_places = Place.objects.filter(
-                    location__distance_lte=(point, D(m=200))
-                )
-
-                # Find places with similar names
-                if 'name' in response_data and response_data['name']:
-                    from django.db.models import Q
-                    similar_name_places = Place.objects.filter(
-                        Q(name__icontains=response_data['name']) |
-                        Q(name__icontains=selected_text)
-                    ).exclude(id__in=[p.id for p in nearby_places])
-
-            # Add nearby and similar name places to the response
-            response_data['nearby_places'] = [
-                {
-                    "id": p.id,
-                    "name": p.name,
-                    "type": p.type,
-                    "city": p.city
-                } for p in nearby_places
-            ]
-
-            response_data['similar_name_places'] = [
-                {
-                    "id": p.id,
-                    "name": p.name,
-                    "type": p.type,
-                    "city": p.city
-                } for p in similar_name_places
-            ]
-
-            return JsonResponse(response_data)
-        except JSONDecodeError:
-            logger.error(f"Error decoding JSON from response : {response}")
-            return JsonResponse({"error": "Invalid JSON"}, status=400)
-        except KeyError:
-            logger.error("Missing key in JSON from selection")
-            return JsonResponse({"error": "Missing key in JSON"}, status=400)
-        except Exception as e:
-            logger.error(f"Error getting AI response from selection: {e.__str__()}")
-            return JsonResponse({"error": str(e)}, status=500)
+        logger.info("Getting AI response from selection %s ...", selected_text)
+        task_id = tasks.submit(_ask_ai, selected_text)
+        return OrjsonResponse({"status": tasks.PENDING, "task_id": task_id}, status=202)
 
     def ask_ai_from_input(self, request):
-        """Get AI response from user input"""
-        try:
-            # Get the input text from the request
-            data = json.loads(request.body)
-            input_text = data.get('input_text', '')
-
-            if not input_text:
-                return JsonResponse({"error": "No input text provided"}, status=400)
-
-            # Create OpenAI client
-            client = OpenAIClient(model="gpt-4.1")
-
-            logger.info(f"Getting AI response from input {input_text} ...")
-            prompt = get_place_review_prompt(
-                name=input_text,
-                city="",
-                types=[]
-            )
-
-            # Get response from OpenAI
-            response = client.get_websearch_response(prompt, True)
-
-            # Parse the response as JSON
-            if isinstance(response, str):
-                response_data = json.loads(response)
-            else:
-                response_data = response
-
-            # Find nearby and similarly-named places if lat and lon are available
-            nearby_places = []
-            similar_name_places = []
-
-            if 'lat' in response_data and 'lon' in response_data:
-                # Create a point from the lat and lon
-                point = Point(float(response_data['lon']), float(response_data['lat']))
-
-                # Find places within 200 meters
-                from django.contrib.gis.measure import D
-                nearby_places = Place.objects.filter(
-                    location__distance_lte=(point, D(m=200))
-                )
-
-                # Find places with similar names
-                if 'name' in response_data and response_data['name']:
-                    from django.db.models import Q
-                    similar_name_places = Place.objects.filter(
-                        Q(name__icontains=response_data['name']) |
-                        Q(name__icontains=input_text)
-                    ).exclude(id__in=[p.id for p in nearby_places])
-
-            # Add nearby and similar name places to the response
-            response_data['nearby_places'] = [
-                {
-                    "id": p.id,
-                    "name": p.name,
-                    "type": p.type,
-                    "city": p.city
-                } for p in nearby_places
-            ]
-
-            response_data['similar_name_places'] = [
-                {
-                    "id": p.id,
-                    "name": p.name,
-                    "type": p.type,
-                    "city": p.city
-                } for p in similar_name_places
-            ]
-
-            return JsonResponse(response_data)
-        except Exception as e:
-            logger.error(f"Error getting AI response from input: {e.__str__()}")
-            return JsonResponse({"error": str(e)}, status=500)
+        """Start an AI lookup for user input; the result is polled from ai_result"""
+        data, error = _read_json_body(request)
+        if error:
+            return error
+
+        input_text = data.get('input_text', '')
+        if not input_text:
+            return OrjsonResponse({"error": "No input text provided"}, status=400)
+
+        logger.info("Getting AI response from input %s ...", input_text)
+        task_id = tasks.submit(_ask_ai, input_text)
+        return OrjsonResponse({"status": tasks.PENDING, "task_id": task_id}, status=202)
+
+    def ai_result(self, request, task_id):
+        """Return the AI response once the task has finished, 202 while it is still running"""
+        state = tasks.get_state(task_id)
+        if state is None:
+            return OrjsonResponse({"error": "Unknown or expired task"}, status=404)
+        if state["status"] == tasks.PENDING:
+            return OrjsonResponse({"status": tasks.PENDING}, status=202)
+        if state["status"] == tasks.FAILED:
+            return OrjsonResponse({"error": state["error"]}, status=500)
+        return OrjsonResponse(state["result"])
 
     def save_as_place(self, request, post_id):
         """Save AI response as a Place"""
         if request.method != 'POST':
-            return JsonResponse({"error": "Only POST method is allowed"}, status=405)
+            return OrjsonResponse({"error": "Only POST method is allowed"}, status=405)
 
-        scraped_post = get_object_or_404(ScrapedPost, id=post_id)
+        # Only the pk is needed to link the new Place
+        scraped_post = get_object_or_404(ScrapedPost.objects.only('id'), id=post_id)
 
-        try:
-            # Parse the JSON data from the request
-            data = json.loads(request.body)
+        data, error = _read_json_body(request)
+        if error:
+            return error
 
+        try:
             # Create a Point object from lat and lon
             if 'lat' in data and 'lon' in data:
                 location = Point(float(data['lon']), float(data['lat']))
             else:
-                return JsonResponse({"error": "Latitude and longitude are required"}, status=400)
+                return OrjsonResponse({"error": "Latitude and longitude are required"}, status=400)
 
             # Map season value to PlaceSeasonType
             season_mapping = {
@@ -281,28 +280,30 @@ class ScrapedPostAdmin(admin.ModelAdmin):
                     if hasattr(Place.PlaceType, type_upper):
                         types.append(getattr(Place.PlaceType, type_upper))
 
-            # Create and save the Place object
-            place = Place(
-                name=data.get('name', ''),
-                scraped_id=scraped_post,
-                type=types,
-                description=data.get('description', ''),
-                location=location,
-                country_code=data.get('country_code', ''),
-                city=data.get('city', ''),
-                min_age=data.get('min_age'),
-                max_age=data.get('max_age'),
-                website=data.get('website', ''),
-                street=data.get('street', ''),
-                zip_code=data.get('zip_code', ''),
-                season=season,
-                is_admission_free=data.get('is_admission_free', False),
-                car_needed = data.get('is_admission_free', False)
-            )
-            place.save()
+            # The INSERT, the related_places_count bump and the re-read commit together
+            with transaction.atomic():
+                place = Place.objects.create(
+                    name=data.get('name', ''),
+                    scraped_id=scraped_post,
+                    type=types,
+                    description=data.get('description', ''),
+                    location=location,
+                    country_code=data.get('country_code', ''),
+                    city=data.get('city', ''),
+                    min_age=data.get('min_age'),
+                    max_age=data.get('max_age'),
+                    website=data.get('website', ''),
+                    street=data.get('street', ''),
+                    zip_code=data.get('zip_code', ''),
+                    season=season,
+                    is_admission_free=data.get('is_admission_free', False),
+                    car_needed = data.get('is_admission_free', False)
+                )
 
-            # Get all Places related to this ScrapedPlace
-            related_places = Place.objects.filter(scraped_id=scraped_post)
+                # Get all Places related to this ScrapedPlace, as plain dicts for the JSON response
+                related_places = list(
+                    Place.objects.filter(scraped_id=scraped_post).values('id', 'name', 'type', 'city')
+                )
 
             # Prepare the response data
             response_data = {
@@ -321,29 +322,23 @@ class ScrapedPostAdmin(admin.ModelAdmin):
                     "season": place.season,
                     "is_admission_free": place.is_admission_free
                 },
-                "related_places": [
-                    {
-                        "id": p.id,
-                        "name": p.name,
-                        "type": p.type,
-                        "city": p.city
-                    } for p in related_places
-                ]
+                "related_places": related_places
             }
 
-            return JsonResponse(response_data)
+            return OrjsonResponse(response_data)
         except Exception as e:
-            return JsonResponse({"error": str(e)}, status=500)
+            return OrjsonResponse({"error": str(e)}, status=500)
 
     def geocode_place(self, request, place_id):
         """Geocode a place using the geocode_address function"""
         if request.method != 'POST':
-            return JsonResponse({"error": "Only POST method is allowed"}, status=405)
+            return OrjsonResponse({"error": "Only POST method is allowed"}, status=405)
 
-        try:
-            # Parse the JSON data from the request
-            data = json.loads(request.body)
+        data, error = _read_json_body(request)
+        if error:
+            return error
 
+        try:
             # Extract address components
             street = data.get('street', '')
             zip_code = data.get('zip_code', '')
@@ -362,25 +357,27 @@ class ScrapedPostAdmin(admin.ModelAdmin):
 
             if point:
                 # Return the coordinates
-                return JsonResponse({
+                return OrjsonResponse({
                     "success": True,
                     "lat": point.y,
                     "lon": point.x
                 })
             else:
                 # Return error if geocoding failed
-                return JsonResponse({
+                return OrjsonResponse({
                     "success": False,
                     "error": "Geocoding failed. Please check the address."
                 })
         except Exception as e:
-            return JsonResponse({"error": str(e)}, status=500)
+            return OrjsonResponse({"error": str(e)}, status=500)
 
-class ScrapedPlaceAdmin(admin.ModelAdmin):
+class ScrapedPlaceAdmin(ChangelistFieldsMixin, admin.ModelAdmin):
     list_display = ('name', 'processed')
     ordering = ('name',)
     list_filter = ('processed',)
     search_fields = ('name',)
+    # city is read by __str__ (e.g. in the delete action confirmation)
+    changelist_fields = ('id', 'name', 'city', 'processed')
 
 
 
@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class ScrapingConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'scraping'
+
+    def ready(self):
+        """
+        Check that background task state is visible to every worker.
+        """
+        from scraping.tasks import check_shared_cache
+        check_shared_cache()
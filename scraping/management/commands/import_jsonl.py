@@ -1,9 +1,21 @@
 import json
 import os
+from itertools import batched
 from django.core.management.base import BaseCommand, CommandError
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
 from scraping.models import ScrapedPlace, ScrapedPost
 
+try:
+    # orjson parses the raw bytes of a line several times faster than json
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+# Number of JSONL records buffered per bulk INSERT round
+BATCH_SIZE = 1000
+# Places per INSERT; a single record can carry many places
+PLACE_BATCH_SIZE = 2000
+
 
 class Command(BaseCommand):
     help = 'Imports data from a JSONL file into the database'
@@ -31,48 +43,36 @@ class Command(BaseCommand):
         duplicates = 0
 
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
+            # third_party_id -> ScrapedPost pk, starting with the posts already in
+            # the database; import_batch adds the posts it creates
+            post_ids = self.load_existing_post_ids(file_path)
+
+            # One transaction for the whole file: a single COMMIT, and a failed
+            # import leaves no partial data behind
+            with transaction.atomic(), open(file_path, 'rb') as file:
+                batch = []
                 for line in file:
                     # Parse the JSON line
-                    data = json.loads(line.strip())
+                    data = json_loads(line)
 
                     # Check if places key is missing or places array is empty
                     if 'places' not in data or not data['places']:
                         skipped += 1
                         continue
 
-                    # Check if a post with the same third_party_id already exists
-                    third_party_id = str(data.get('id', ''))
-                    existing_post = ScrapedPost.objects.filter(third_party_id=third_party_id).first()
-
-                    if existing_post:
-                        post = existing_post
-                        duplicates += 1
-                    else:
-                        # Create a new ScrapedPost
-                        post = ScrapedPost(
-                            third_party_id=third_party_id,
-                            third_party_type=data_type,
-                            title=data.get('title', ''),
-                            content=data.get('perex', ''),
-                            comments=data.get('comments', []),
-                            probability=data.get('probability', 0.0),
-                            original_created_at=data.get('created', 0.0),
-                        )
-                        post.save()
-                        processed_posts += 1
-
-                    # Process all places in the data
-                    for place_data in data['places']:
-                        # Create ScrapedPlace associated with the post
-                        place = ScrapedPlace(
-                            name=place_data.get('name', ''),
-                            types=place_data.get('types', []),
-                            city=place_data.get('city', ''),
-                            post=post
-                        )
-                        place.save()
-                        processed_places += 1
+                    batch.append(data)
+                    if len(batch) >= BATCH_SIZE:
+                        posts, places, dupes = self.import_batch(batch, data_type, post_ids)
+                        processed_posts += posts
+                        processed_places += places
+                        duplicates += dupes
+                        batch = []
+
+                if batch:
+                    posts, places, dupes = self.import_batch(batch, data_type, post_ids)
+                    processed_posts += posts
+                    processed_places += places
+                    duplicates += dupes
 
             self.stdout.write(self.style.SUCCESS(
                 f"Successfully imported {processed_posts} posts with {processed_places} places. "
@@ -81,3 +81,84 @@ class Command(BaseCommand):
 
         except Exception as e:
             raise CommandError(f"Error importing data: {str(e)}")
+
+    def load_existing_post_ids(self, file_path):
+        """
+        Map the file's third_party_ids that already exist to their post pk.
+
+        Reads the file once to collect the ids and resolves them all with a
+        single query, so the import itself never checks duplicates against the DB.
+        """
+        ids = set()
+        with open(file_path, 'rb') as file:
+            for line in file:
+                data = json_loads(line)
+                if data.get('places'):
+                    ids.add(str(data.get('id', '')))
+
+        post_ids = {}
+        existing = (
+            ScrapedPost.objects.filter(third_party_id__in=ids)
+            .order_by('pk')
+            .values_list('third_party_id', 'pk')
+        )
+        # Stream the matches through a server-side cursor instead of caching them all
+        for third_party_id, pk in existing.iterator(chunk_size=BATCH_SIZE):
+            # Keep the oldest post, like filter(...).first() did
+            post_ids.setdefault(third_party_id, pk)
+        return post_ids
+
+    def import_batch(self, batch, data_type, post_ids):
+        """
+        Insert one batch of JSONL records with a bulk INSERT per model.
+
+        Posts whose third_party_id is already in post_ids are reused and
+        their places attached to them; no query is needed for the check.
+
+        Args:
+            batch: Parsed JSONL records that have at least one place
+            data_type: Type of the data source
+            post_ids: third_party_id -> post pk map, updated in place with new posts
+
+        Returns:
+            Tuple of (new posts, new places, duplicate posts)
+        """
+        new_posts = {}
+        duplicates = 0
+        for data in batch:
+            third_party_id = str(data.get('id', ''))
+            if third_party_id in post_ids or third_party_id in new_posts:
+                duplicates += 1
+                continue
+
+            new_posts[third_party_id] = ScrapedPost(
+                third_party_id=third_party_id,
+                third_party_type=data_type,
+                title=data.get('title', ''),
+                content=data.get('perex', ''),
+                comments=data.get('comments', []),
+                probability=data.get('probability', 0.0),
+                original_created_at=data.get('created', 0.0),
+            )
+
+        # Postgres returns the new primary keys from the bulk INSERT
+        ScrapedPost.bulk_create_with_timestamps(list(new_posts.values()), batch_size=BATCH_SIZE)
+        post_ids.update((third_party_id, post.pk) for third_party_id, post in new_posts.items())
+
+        # Build the places lazily and insert them a chunk at a time
+        places = (
+            ScrapedPlace(
+                name=place_data.get('name', ''),
+                types=place_data.get('types', []),
+                city=place_data.get('city', ''),
+                post_id=post_ids[str(data.get('id', ''))]
+            )
+            for data in batch
+            for place_data in data['places']
+        )
+        created_places = 0
+        for chunk in batched(places, PLACE_BATCH_SIZE):
+            ScrapedPlace.objects.bulk_create(chunk)
+            created_places += len(chunk)
+
+        return len(new_posts), created_places, duplicates
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2025-07-16 08:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scraping', '0008_alter_scrapedplace_post'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='scrapedpost',
+            name='third_party_id',
+            field=models.CharField(db_index=True, max_length=255),
+        ),
+    ]
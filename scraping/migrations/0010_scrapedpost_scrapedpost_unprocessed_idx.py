@@ -0,0 +1,17 @@
+# Generated by Django 5.2.1 on 2025-07-16 10:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scraping', '0009_alter_scrapedpost_third_party_id'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='scrapedpost',
+            index=models.Index(condition=models.Q(('is_processed', False)), fields=['title'], name='scrapedpost_unprocessed_idx'),
+        ),
+    ]
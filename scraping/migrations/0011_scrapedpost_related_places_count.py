@@ -0,0 +1,35 @@
+# Generated by Django 5.2.1 on 2025-07-16 11:30
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_related_places_count(apps, schema_editor):
+    ScrapedPost = apps.get_model('scraping', 'ScrapedPost')
+    Place = apps.get_model('place', 'Place')
+    counts = (
+        Place.objects.filter(scraped_id=OuterRef('pk'))
+        .order_by()
+        .values('scraped_id')
+        .annotate(count=Count('id'))
+        .values('count')
+    )
+    ScrapedPost.objects.update(related_places_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('place', '0011_place_place_created_at_brin'),
+        ('scraping', '0010_scrapedpost_scrapedpost_unprocessed_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scrapedpost',
+            name='related_places_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_related_places_count, migrations.RunPython.noop),
+    ]
@@ -5,7 +5,7 @@ from common.models import CreatedUpdatedModel
 
 
 class ScrapedPost(CreatedUpdatedModel,models.Model):
-    third_party_id = models.CharField(max_length=255)
+    third_party_id = models.CharField(max_length=255, db_index=True)
     third_party_type = models.CharField(max_length=255)
     title = models.CharField(max_length=255)
     content = models.TextField()
@@ -13,6 +13,14 @@ class ScrapedPost(CreatedUpdatedModel,models.Model):
     probability = models.FloatField()
     original_created_at = models.DateTimeField()
     is_processed = models.BooleanField(default=False)
+    # Number of Places created from this post, kept in sync by place.signals
+    related_places_count = models.PositiveIntegerField(default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            # The review queue takes the first unprocessed post by title
+            models.Index(fields=['title'], condition=models.Q(is_processed=False), name='scrapedpost_unprocessed_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} ({self.third_party_type})"
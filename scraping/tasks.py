@@ -0,0 +1,94 @@
+"""
+Minimal background task runner for slow admin work (OpenAI web searches).
+
+Tasks run on a small in-process thread pool, so the request that starts one
+returns immediately, and publish their state to the Django cache where the
+polling request picks it up. Nothing is persisted: tasks still queued or
+running when the process stops or restarts are lost, and their state stays
+pending until TASK_RESULT_TTL expires.
+
+With the default LocMemCache the state is only visible inside the process
+that ran the task, so the poll would 404 whenever it lands on another worker.
+Deployments with several workers set SCRAPING_TASKS_REQUIRE_SHARED_CACHE
+(on by default when WEB_CONCURRENCY > 1), and the app then refuses to start
+unless REDIS_URL provides a shared cache.
+"""
+import logging
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+TASK_WORKERS = 4
+TASK_RESULT_TTL = 60 * 60
+TASK_CACHE_PREFIX = "scraping:task:"
+
+# Backends whose entries are invisible to other worker processes
+PROCESS_LOCAL_CACHES = {
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+}
+
+PENDING = 'pending'
+DONE = 'done'
+FAILED = 'failed'
+
+_executor = ThreadPoolExecutor(max_workers=TASK_WORKERS, thread_name_prefix="scraping-task")
+
+
+def _cache_key(task_id: str) -> str:
+    return TASK_CACHE_PREFIX + task_id
+
+
+def check_shared_cache() -> None:
+    """
+    Refuse a process-local cache when SCRAPING_TASKS_REQUIRE_SHARED_CACHE is set.
+
+    Raises:
+        ImproperlyConfigured: If task state would be invisible to the other workers
+    """
+    backend = settings.CACHES['default']['BACKEND']
+    if getattr(settings, 'SCRAPING_TASKS_REQUIRE_SHARED_CACHE', False) and backend in PROCESS_LOCAL_CACHES:
+        raise ImproperlyConfigured(
+            f"Background tasks need a cache shared by all worker processes, but the default "
+            f"cache is {backend}; set REDIS_URL or run a single worker."
+        )
+
+
+def submit(fn: Callable[..., Any], *args: Any) -> str:
+    """
+    Run fn(*args) in the background.
+
+    Returns:
+        The task id to pass to get_state()
+    """
+    task_id = uuid.uuid4().hex
+    cache.set(_cache_key(task_id), {"status": PENDING}, TASK_RESULT_TTL)
+    _executor.submit(_run, task_id, fn, args)
+    return task_id
+
+
+def get_state(task_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Current state of a task: {"status": PENDING}, {"status": DONE, "result": ...}
+    or {"status": FAILED, "error": ...}. None for unknown or expired tasks.
+    """
+    return cache.get(_cache_key(task_id))
+
+
+def _run(task_id: str, fn: Callable[..., Any], args: tuple) -> None:
+    try:
+        state = {"status": DONE, "result": fn(*args)}
+    except Exception as e:
+        logger.exception("Background task %s failed", task_id)
+        state = {"status": FAILED, "error": str(e)}
+    finally:
+        # The pool threads outlive requests, so release their DB connections like a request would
+        close_old_connections()
+    cache.set(_cache_key(task_id), state, TASK_RESULT_TTL)
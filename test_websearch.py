@@ -27,22 +27,11 @@ def test_websearch():
         print(f"Testing get_websearch_response with prompt: '{prompt}'")
         
         # Call the get_websearch_response function
-        response = client.get_websearch_response(prompt)
+        response = client.get_websearch_response(prompt, is_json_response=False)
         
         # Print the response content
         print("\nResponse content:")
-        print(response['content'])
-        
-        # Print the number of citations
-        print(f"\nNumber of citations: {len(response['citations'])}")
-        
-        # Print the first citation if available
-        if response['citations']:
-            print("\nFirst citation:")
-            citation = response['citations'][0]
-            print(f"Title: {citation['title']}")
-            print(f"URL: {citation['url']}")
-            print(f"Snippet: {citation['snippet'][:100]}...")
+        print(response)
         
         print("\nTest completed successfully!")
         return True
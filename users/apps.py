@@ -8,6 +8,5 @@ class UsersConfig(AppConfig):
     def ready(self):
         """
         Connect signals when the app is ready.
-        This ensures that the signal handlers in models.py are properly registered.
         """
-        import users.models  # Import the models module to connect signals
+        import users.signals  # noqa: F401
@@ -15,17 +15,48 @@ Usage:
     host: Optional API host (default: http://localhost:8000)
 
 Requirements:
-    pip install requests
+    pip install httpx
 """
 import argparse
+import asyncio
+import base64
 import json
-import random
-import string
+import secrets
 import sys
 import time
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
-import requests
+import httpx
+
+# Seconds before the access token's exp claim at which it is refreshed
+TOKEN_REFRESH_MARGIN = 30
+
+# Shared by the client methods, batched requests and the post-logout checks in main()
+ME_QUERY = """
+query {
+    me {
+        id
+        username
+        email
+        profile {
+            role
+        }
+    }
+}
+"""
+
+REFRESH_TOKEN_MUTATION = """
+mutation RefreshToken($input: RefreshTokenInput!) {
+    refreshToken(input: $input) {
+        success
+        message
+        tokens {
+            access { token }
+            refresh { token }
+        }
+    }
+}
+"""
 
 
 class FamilyMapClient:
@@ -42,10 +73,48 @@ class FamilyMapClient:
         self.graphql_url = f"{base_url}/graphql/"
         self.access_token = None
         self.refresh_token = None
+        self.access_token_exp = None
         self.username = None
+        # Reuse keep-alive connections instead of a new TCP/TLS handshake per call
+        self.session = httpx.AsyncClient()
+    
+    async def aclose(self) -> None:
+        """Close the underlying HTTP connections."""
+        await self.session.aclose()
+    
+    @staticmethod
+    def _token_exp(token: str) -> Optional[float]:
+        """
+        Read the exp claim of a JWT without verifying it.
+        
+        Args:
+            token: Encoded JWT
+            
+        Returns:
+            Expiry as a Unix timestamp, or None if the token has no readable exp
+        """
+        try:
+            payload = token.split(".")[1]
+            # JWT segments are unpadded base64url
+            claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+            return float(claims["exp"])
+        except (IndexError, KeyError, TypeError, ValueError):
+            return None
     
-    def execute_graphql(self, query: str, variables: Optional[Dict[str, Any]] = None, 
-                        auth: bool = False) -> Dict[str, Any]:
+    def _set_tokens(self, tokens: Dict[str, Any]) -> None:
+        """Store the access and refresh tokens from a login or refresh result."""
+        self.access_token = tokens["access"]["token"]
+        self.refresh_token = tokens["refresh"]["token"]
+        self.access_token_exp = self._token_exp(self.access_token)
+    
+    async def _ensure_fresh_access_token(self) -> None:
+        """Refresh the access token ahead of time when it is about to expire."""
+        if (self.access_token and self.refresh_token and self.access_token_exp is not None
+                and time.time() > self.access_token_exp - TOKEN_REFRESH_MARGIN):
+            await self.refresh_tokens()
+    
+    async def execute_graphql(self, query: str, variables: Optional[Dict[str, Any]] = None, 
+                              auth: bool = False) -> Dict[str, Any]:
         """
         Execute a GraphQL query or mutation.
         
@@ -59,6 +128,10 @@ class FamilyMapClient:
         """
         headers = {"Content-Type": "application/json"}
         
+        if auth:
+            # Refresh before sending rather than after a rejected request
+            await self._ensure_fresh_access_token()
+        
         if auth and self.access_token:
             headers["Authorization"] = f"Bearer {self.access_token}"
         
@@ -67,20 +140,59 @@ class FamilyMapClient:
             "variables": variables or {}
         }
         
-        response = requests.post(
+        response = await self.session.post(
             self.graphql_url,
             headers=headers,
             json=data
         )
         
-        if not response.ok:
+        if not response.is_success:
             print(f"HTTP Error: {response.status_code}")
             print(response.text)
             return {"errors": [{"message": f"HTTP Error: {response.status_code}"}]}
         
         return response.json()
     
-    def register_user(self, username: str, email: str, password: str) -> Dict[str, Any]:
+    async def batch_execute(self, operations: List[Tuple[str, Optional[Dict[str, Any]]]],
+                            auth: bool = False) -> List[Dict[str, Any]]:
+        """
+        Execute several independent GraphQL operations in one HTTP request.
+        
+        Args:
+            operations: (query, variables) pairs, executed in order
+            auth: Whether to include the Authorization header
+            
+        Returns:
+            List of GraphQL responses, one per operation
+        """
+        headers = {"Content-Type": "application/json"}
+        
+        if auth:
+            # Refresh before sending rather than after a rejected request
+            await self._ensure_fresh_access_token()
+        
+        if auth and self.access_token:
+            headers["Authorization"] = f"Bearer {self.access_token}"
+        
+        data = [
+            {"query": query, "variables": variables or {}}
+            for query, variables in operations
+        ]
+        
+        response = await self.session.post(
+            self.graphql_url,
+            headers=headers,
+            json=data
+        )
+        
+        if not response.is_success:
+            print(f"HTTP Error: {response.status_code}")
+            print(response.text)
+            return [{"errors": [{"message": f"HTTP Error: {response.status_code}"}]}] * len(operations)
+        
+        return response.json()
+    
+    async def register_user(self, username: str, email: str, password: str) -> Dict[str, Any]:
         """
         Register a new user.
         
@@ -116,14 +228,14 @@ class FamilyMapClient:
             }
         }
         
-        result = self.execute_graphql(mutation, variables)
+        result = await self.execute_graphql(mutation, variables)
         
         if result.get("data", {}).get("register", {}).get("success"):
             self.username = username
         
         return result
     
-    def login(self, username: str, password: str) -> Dict[str, Any]:
+    async def login(self, username: str, password: str) -> Dict[str, Any]:
         """
         Login and get JWT tokens.
         
@@ -161,74 +273,44 @@ class FamilyMapClient:
             }
         }
         
-        result = self.execute_graphql(mutation, variables)
+        result = await self.execute_graphql(mutation, variables)
         
         if result.get("data", {}).get("login", {}).get("success"):
-            tokens = result["data"]["login"]["tokens"]
-            self.access_token = tokens["access"]["token"]
-            self.refresh_token = tokens["refresh"]["token"]
+            self._set_tokens(result["data"]["login"]["tokens"])
             self.username = username
         
         return result
     
-    def get_me(self) -> Dict[str, Any]:
+    async def get_me(self) -> Dict[str, Any]:
         """
         Get the current user's information (protected endpoint).
         
         Returns:
             Dict containing the user information
         """
-        query = """
-        query {
-            me {
-                id
-                username
-                email
-                profile {
-                    role
-                }
-            }
-        }
-        """
-        
-        return self.execute_graphql(query, auth=True)
+        return await self.execute_graphql(ME_QUERY, auth=True)
     
-    def refresh_tokens(self) -> Dict[str, Any]:
+    async def refresh_tokens(self) -> Dict[str, Any]:
         """
         Refresh the access and refresh tokens.
         
         Returns:
             Dict containing the refresh result
         """
-        mutation = """
-        mutation RefreshToken($input: RefreshTokenInput!) {
-            refreshToken(input: $input) {
-                success
-                message
-                tokens {
-                    access { token }
-                    refresh { token }
-                }
-            }
-        }
-        """
-        
         variables = {
             "input": {
                 "refreshToken": self.refresh_token
             }
         }
         
-        result = self.execute_graphql(mutation, variables)
+        result = await self.execute_graphql(REFRESH_TOKEN_MUTATION, variables)
         
         if result.get("data", {}).get("refreshToken", {}).get("success"):
-            tokens = result["data"]["refreshToken"]["tokens"]
-            self.access_token = tokens["access"]["token"]
-            self.refresh_token = tokens["refresh"]["token"]
+            self._set_tokens(result["data"]["refreshToken"]["tokens"])
         
         return result
     
-    def logout(self) -> Dict[str, Any]:
+    async def logout(self) -> Dict[str, Any]:
         """
         Logout by blacklisting the refresh token.
         
@@ -250,18 +332,20 @@ class FamilyMapClient:
             }
         }
         
-        result = self.execute_graphql(mutation, variables, auth=True)
+        result = await self.execute_graphql(mutation, variables, auth=True)
         
         if result.get("data", {}).get("logout", {}).get("success"):
             self.access_token = None
             self.refresh_token = None
+            self.access_token_exp = None
         
         return result
 
 
 def generate_random_credentials():
     """Generate random username, email and password for testing."""
-    random_str = ''.join(random.choices(string.ascii_lowercase + string.digits, k=8))
+    # 8 lowercase hex characters from the OS CSPRNG
+    random_str = secrets.token_hex(4)
     username = f"test_user_{random_str}"
     email = f"test_{random_str}@example.com"
     password = f"Password{random_str}!"
@@ -281,7 +365,7 @@ def print_result(result):
     print(json.dumps(result, indent=2))
 
 
-def main():
+async def main():
     """Run the JWT authentication flow demonstration."""
     parser = argparse.ArgumentParser(description="JWT Authentication Flow Example")
     parser.add_argument("host", nargs="?", default="http://localhost:8000", 
@@ -300,7 +384,7 @@ def main():
         print(f"Email: {email}")
         print(f"Password: {password}")
         
-        register_result = client.register_user(username, email, password)
+        register_result = await client.register_user(username, email, password)
         print_result(register_result)
         
         if not register_result.get("data", {}).get("register", {}).get("success"):
@@ -309,7 +393,7 @@ def main():
         
         # Step 2: Login to get tokens
         print_section("2. Login to get tokens")
-        login_result = client.login(username, password)
+        login_result = await client.login(username, password)
         print_result(login_result)
         
         if not login_result.get("data", {}).get("login", {}).get("success"):
@@ -318,15 +402,15 @@ def main():
         
         # Step 3: Access a protected endpoint
         print_section("3. Access a protected endpoint (me query)")
-        me_result = client.get_me()
+        me_result = await client.get_me()
         print_result(me_result)
         
         # Step 4: Refresh the tokens
         print_section("4. Refresh the tokens")
         print("Waiting 2 seconds before refreshing tokens...")
-        time.sleep(2)  # Wait a bit to ensure token timestamps differ
+        await asyncio.sleep(2)  # Wait a bit to ensure token timestamps differ
         
-        refresh_result = client.refresh_tokens()
+        refresh_result = await client.refresh_tokens()
         print_result(refresh_result)
         
         if not refresh_result.get("data", {}).get("refreshToken", {}).get("success"):
@@ -335,22 +419,31 @@ def main():
         
         # Verify the new token works
         print("\nVerifying the new token with another me query:")
-        me_result_after_refresh = client.get_me()
+        me_result_after_refresh = await client.get_me()
         print_result(me_result_after_refresh)
         
         # Step 5: Logout
         print_section("5. Logout")
-        logout_result = client.logout()
+        blacklisted_refresh_token = client.refresh_token
+        logout_result = await client.logout()
         print_result(logout_result)
         
+        # The two logout checks only read the client's (now cleared) tokens, so
+        # they can be in flight at the same time
+        me_result_after_logout, refresh_after_logout = await asyncio.gather(
+            client.get_me(),
+            client.execute_graphql(
+                REFRESH_TOKEN_MUTATION,
+                {"input": {"refreshToken": blacklisted_refresh_token}}
+            ),
+        )
+        
         # Verify logout worked by trying to use the token again
         print("\nVerifying logout by trying to use the token again:")
-        me_result_after_logout = client.get_me()
         print_result(me_result_after_logout)
         
         # Try to refresh the blacklisted token
         print("\nTrying to refresh the blacklisted token:")
-        refresh_after_logout = client.refresh_tokens()
         print_result(refresh_after_logout)
         
         print("\nJWT authentication flow demonstration completed successfully!")
@@ -359,7 +452,9 @@ def main():
     except Exception as e:
         print(f"Error: {e}")
         return 1
+    finally:
+        await client.aclose()
 
 
 if __name__ == "__main__":
-    sys.exit(main())
+    sys.exit(asyncio.run(main()))
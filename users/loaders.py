@@ -0,0 +1,35 @@
+"""
+DataLoaders for batching user lookups within a single GraphQL request.
+"""
+from typing import List, Optional
+
+from strawberry.dataloader import DataLoader
+
+from users import user_cache
+from users.models import User
+from users.schema import USER_TYPE_FIELDS
+
+
+async def load_users(ids: List[str]) -> List[Optional[User]]:
+    """
+    Fetch every requested user, in the order of ids.
+
+    Users in users.user_cache are served from there; the rest are fetched
+    with one query and cached. GraphQL IDs arrive as strings, so results are
+    matched on str(pk). Unknown ids resolve to None.
+    """
+    ids = [str(id) for id in ids]
+    users = await user_cache.aget_many(ids)
+
+    missing = [id for id in ids if id not in users]
+    if missing:
+        loaded = [user async for user in User.objects.only(*USER_TYPE_FIELDS).filter(pk__in=missing)]
+        await user_cache.aset_many(loaded)
+        users.update((str(user.pk), user) for user in loaded)
+
+    return [users.get(id) for id in ids]
+
+
+def create_user_loader() -> DataLoader:
+    """Create a new user loader; use one per request so the cache never outlives it."""
+    return DataLoader(load_fn=load_users)
@@ -17,6 +17,11 @@ class Command(BaseCommand):
         parser.add_argument('--first-name', type=str, help='First name for the admin user', default='')
         parser.add_argument('--last-name', type=str, help='Last name for the admin user', default='')
         parser.add_argument('--no-input', action='store_true', help='Run command without interactive prompts')
+        parser.add_argument(
+            '--skip-validation',
+            action='store_true',
+            help='With --no-input, skip password strength validation (for passwords from a trusted provisioning source)'
+        )
 
     def handle(self, *args, **options):
         username = options['username']
@@ -25,6 +30,7 @@ class Command(BaseCommand):
         first_name = options['first_name']
         last_name = options['last_name']
         no_input = options['no_input']
+        skip_validation = options['skip_validation']
 
         # Interactive mode if no_input is False
         if not no_input:
@@ -63,11 +69,12 @@ class Command(BaseCommand):
         if not password:
             raise CommandError('Password is required')
         
-        # Validate password strength
-        try:
-            validate_password(password)
-        except ValidationError as e:
-            raise CommandError(f'Password validation failed: {", ".join(e.messages)}')
+        # Validate password strength; scripted runs may opt out
+        if not (no_input and skip_validation):
+            try:
+                validate_password(password)
+            except ValidationError as e:
+                raise CommandError(f'Password validation failed: {", ".join(e.messages)}')
         
         # Create the admin user
         user, success, message = create_admin_user(
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.1 on 2026-10-15 14:40
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def check_duplicate_emails(apps, schema_editor):
+    User = apps.get_model('users', 'User')
+    duplicates = (
+        User.objects.exclude(email='')
+        .order_by()
+        .values('email')
+        .annotate(count=Count('pk'))
+        .filter(count__gt=1)
+        .order_by('email')
+    )
+    if duplicates:
+        listing = ', '.join(f"{row['email']} ({row['count']} users)" for row in duplicates)
+        raise RuntimeError(
+            f"Cannot add users_user_email_unique: these emails belong to several users: {listing}. "
+            f"Change or blank the extra users' emails, then run the migration again."
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_user_role_index_email_username_trgm'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicate_emails, migrations.RunPython.noop),
+        # The unique constraint's index serves email lookups from here on
+        migrations.RemoveIndex(
+            model_name='user',
+            name='users_user_email_idx',
+        ),
+        migrations.AddConstraint(
+            model_name='user',
+            constraint=models.UniqueConstraint(condition=models.Q(('email', ''), _negated=True), fields=('email',), name='users_user_email_unique'),
+        ),
+    ]
@@ -1,5 +1,7 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
-from django.contrib.auth.models import  AbstractUser
+from django.db.models.functions import Upper
+from django.contrib.auth.models import AbstractUser
 
 
 class UserRole:
@@ -15,7 +17,11 @@ class UserRole:
     ]
 
 
-class User(AbstractUser,models.Model):
+# Partial unique constraint on User.email; register maps its violation to a message
+EMAIL_UNIQUE_CONSTRAINT = 'users_user_email_unique'
+
+
+class User(AbstractUser):
     """
     User profile model that extends Django's built-in User model.
     Contains additional user information specific to the family map application.
@@ -28,8 +34,25 @@ class User(AbstractUser,models.Model):
         max_length=20,
         choices=UserRole.CHOICES,
         default=UserRole.FREEMIUM_USER,
-        help_text="User's role in the application"
+        help_text="User's role in the application",
+        db_index=True
     )
+
+    class Meta(AbstractUser.Meta):
+        constraints = [
+            # register relies on this to reject a taken email in its INSERT;
+            # blank emails (allowed by AbstractUser) may repeat
+            models.UniqueConstraint(
+                fields=['email'],
+                condition=~models.Q(email=''),
+                name=EMAIL_UNIQUE_CONSTRAINT,
+            ),
+        ]
+        indexes = [
+            # username__icontains compiles to UPPER(username) LIKE UPPER('%...%'),
+            # which only a trigram index on the same expression can serve
+            GinIndex(OpClass(Upper('username'), name='gin_trgm_ops'), name='users_user_username_trgm'),
+        ]
     
     def __str__(self):
         return f"{self.user.username}'s profile"
@@ -1,10 +1,12 @@
 import strawberry
 import typing
+from asgiref.sync import sync_to_async
+from django.db import IntegrityError, transaction
 from strawberry.django import auth
 from strawberry import auto
 from strawberry.types import Info
 
-from users.models import User, UserRole
+from users.models import EMAIL_UNIQUE_CONSTRAINT, User, UserRole
 from auth_api.graphql.permissions import IsAuthenticated, IsAdmin
 
 
@@ -20,6 +22,20 @@ class UserType:
     is_active: auto
 
 
+# Columns backing UserType; resolvers load only these
+USER_TYPE_FIELDS = ('id', 'username', 'email', 'first_name', 'last_name', 'date_joined', 'is_active')
+
+
+# Postgres SQLSTATE for unique_violation
+UNIQUE_VIOLATION = '23505'
+
+
+def _create_user(**fields) -> User:
+    # Savepoint so a rejected INSERT leaves any outer transaction usable
+    with transaction.atomic():
+        return User.objects.create_user(**fields)
+
+
 # Input type for user registration
 @strawberry.input
 class UserRegistrationInput:
@@ -46,43 +62,47 @@ class UserRegistrationResult:
 @strawberry.type
 class Mutation:
     @strawberry.mutation
-    def register(self, info: Info, input: UserRegistrationInput) -> UserRegistrationResult:
-        # Check if username already exists
-        if User.objects.filter(username=input.username).exists():
-            return UserRegistrationResult(
-                success=False,
-                message="Username already exists"
-            )
-        
-        # Check if email already exists
-        if User.objects.filter(email=input.email).exists():
-            return UserRegistrationResult(
-                success=False,
-                message="Email already exists"
-            )
-        
+    async def register(self, info: Info, input: UserRegistrationInput) -> UserRegistrationResult:
         try:
-            # Create the user
-            user = User.objects.create_user(
+            # A single INSERT; the unique constraints on username and email
+            # reject collisions, so no separate existence check is needed
+            user = await sync_to_async(_create_user)(
                 username=input.username,
                 email=input.email,
                 password=input.password,
                 first_name=input.first_name,
-                last_name=input.last_name
+                last_name=input.last_name,
+                bio=input.bio,
+                phone_number=input.phone_number,
+                default_location=input.default_location,
+                role=input.role
             )
             
-            # Update profile information
-            user.bio = input.bio
-            user.phone_number = input.phone_number
-            user.default_location = input.default_location
-            user.role = input.role
-            user.save()
-            
             return UserRegistrationResult(
                 success=True,
                 message="User registered successfully",
                 user=user
             )
+        except IntegrityError as e:
+            cause = e.__cause__
+            if getattr(cause, 'sqlstate', None) != UNIQUE_VIOLATION:
+                return UserRegistrationResult(
+                    success=False,
+                    message=f"Registration failed: {str(e)}"
+                )
+            
+            # Check if email already exists
+            if cause.diag.constraint_name == EMAIL_UNIQUE_CONSTRAINT:
+                return UserRegistrationResult(
+                    success=False,
+                    message="Email already exists"
+                )
+            
+            # Otherwise username already exists
+            return UserRegistrationResult(
+                success=False,
+                message="Username already exists"
+            )
         except Exception as e:
             return UserRegistrationResult(
                 success=False,
@@ -94,21 +114,18 @@ class Mutation:
 @strawberry.type
 class Query:
     @strawberry.field(permission_classes=[IsAuthenticated])
-    def me(self, info: Info) -> typing.Optional[UserType]:
-        try:
-            return User.objects.get(id=info.context.request.user.id)
-        except User.DoesNotExist:
-            return None
+    async def me(self, info: Info) -> typing.Optional[UserType]:
+        # JWTAuthMiddleware already loaded the user with every UserType column
+        user = info.context.request.user
+        return user if user.is_authenticated else None
 
-    @strawberry.django.field(permission_classes=[IsAdmin])
-    def user(self, info: Info, id: strawberry.ID) -> typing.Optional[UserType]:
-        try:
-            return User.objects.get(id=id)
-        except User.DoesNotExist:
-            return None
+    @strawberry.field(permission_classes=[IsAdmin])
+    async def user(self, info: Info, id: strawberry.ID) -> typing.Optional[UserType]:
+        # Batched with any other user lookups in the same request
+        return await info.context.user_loader.load(id)
     
-    @strawberry.django.field(permission_classes=[IsAdmin])
-    def users(
+    @strawberry.field(permission_classes=[IsAdmin])
+    async def users(
         self, 
         info: Info, 
         username: typing.Optional[str] = None,
@@ -118,7 +135,7 @@ class Query:
         Returns a list of all users. Only accessible by admins.
         Optional filters for username and role.
         """
-        queryset = User.objects.all()
+        queryset = User.objects.only(*USER_TYPE_FIELDS)
         
         # Apply filters if provided
         if username:
@@ -127,4 +144,5 @@ class Query:
         if role:
             queryset = queryset.filter(role=role)
             
-        return queryset
+        # Materialize with the async ORM so the event loop is not blocked
+        return [user async for user in queryset]
@@ -0,0 +1,19 @@
+"""
+Drop a user's users.user_cache entry whenever the User row changes.
+
+The entry is dropped once the transaction commits; dropping it earlier would
+let a concurrent request cache the old row again before the change is visible.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from users import user_cache
+from users.models import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    pk = instance.pk
+    transaction.on_commit(lambda: user_cache.delete(pk))
@@ -1,110 +1,130 @@
-import json
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 from django.urls import reverse
 
+from rest_framework_simplejwt.tokens import RefreshToken
+
 from users.models import User, UserRole
+from users.tests.utils import json_dumps, json_loads
+
+
+# Authorization header as Django's test client expects it in **extra
+AUTH_HEADER = 'HTTP_AUTHORIZATION'
 
+# Common GraphQL queries and mutations, sent verbatim by every test so the
+# server parses and validates each only once
+REGISTER_MUTATION = '''
+    mutation Register($input: UserRegistrationInput!) {
+        register(input: $input) {
+            success
+            message
+            user {
+                id
+                username
+                email
+            }
+        }
+    }
+'''
+
+LOGIN_MUTATION = '''
+    mutation Login($input: LoginInput!) {
+        login(input: $input) {
+            success
+            message
+            tokens {
+                access { token }
+                refresh { token }
+            }
+            user {
+                id
+                username
+            }
+        }
+    }
+'''
 
+REFRESH_MUTATION = '''
+    mutation RefreshToken($input: RefreshTokenInput!) {
+        refreshToken(input: $input) {
+            success
+            message
+            tokens {
+                access { token }
+                refresh { token }
+            }
+        }
+    }
+'''
+
+LOGOUT_MUTATION = '''
+    mutation Logout($input: LogoutInput!) {
+        logout(input: $input) {
+            success
+            message
+        }
+    }
+'''
+
+ME_QUERY = '''
+    query {
+        me {
+            id
+            username
+            email
+        }
+    }
+'''
+
+USER_QUERY = '''
+    query GetUser($id: ID!) {
+        user(id: $id) {
+            id
+            username
+            email
+        }
+    }
+'''
+
+
+# The production hasher is deliberately slow; these tests only need a working one
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
 class JWTAuthenticationTests(TestCase):
     """
     Test suite for JWT authentication in the GraphQL API.
     Tests user registration, login, token refresh, protected endpoint access, and logout.
     """
     
-    def setUp(self):
-        """Set up test data."""
+    @classmethod
+    def setUpTestData(cls):
+        """Create the users once for the whole class; each test runs in a rolled back transaction."""
         # Create a test user
-        self.test_user = User.objects.create_user(
+        cls.test_user = User.objects.create_user(
             username='testuser',
             email='test@example.com',
             password='testpassword123'
         )
         
         # Create an admin user
-        self.admin_user = User.objects.create_user(
+        cls.admin_user = User.objects.create_user(
             username='adminuser',
             email='admin@example.com',
-            password='adminpassword123'
+            password='adminpassword123',
+            role=UserRole.ADMIN
         )
-        self.admin_user.role = UserRole.ADMIN
-        self.admin_user.save()
+        
+        # Tokens for the tests whose subject is not the login mutation; each
+        # test's blacklist entries are rolled back with its transaction
+        cls.user_access_token, cls.user_refresh_token = cls._issue_tokens(cls.test_user)
+        cls.admin_access_token, _ = cls._issue_tokens(cls.admin_user)
         
         # GraphQL endpoint
-        self.graphql_url = reverse('graphql')
-        
-        # Common GraphQL queries and mutations
-        self.register_mutation = '''
-            mutation Register($input: UserRegistrationInput!) {
-                register(input: $input) {
-                    success
-                    message
-                    user {
-                        id
-                        username
-                        email
-                    }
-                }
-            }
-        '''
-        
-        self.login_mutation = '''
-            mutation Login($input: LoginInput!) {
-                login(input: $input) {
-                    success
-                    message
-                    tokens {
-                        access { token }
-                        refresh { token }
-                    }
-                    user {
-                        id
-                        username
-                    }
-                }
-            }
-        '''
-        
-        self.refresh_mutation = '''
-            mutation RefreshToken($input: RefreshTokenInput!) {
-                refreshToken(input: $input) {
-                    success
-                    message
-                    tokens {
-                        access { token }
-                        refresh { token }
-                    }
-                }
-            }
-        '''
-        
-        self.logout_mutation = '''
-            mutation Logout($input: LogoutInput!) {
-                logout(input: $input) {
-                    success
-                    message
-                }
-            }
-        '''
-        
-        self.me_query = '''
-            query {
-                me {
-                    id
-                    username
-                    email
-                }
-            }
-        '''
-        
-        self.user_query = '''
-            query GetUser($id: ID!) {
-                user(id: $id) {
-                    id
-                    username
-                    email
-                }
-            }
-        '''
+        cls.graphql_url = reverse('graphql')
+    
+    def setUp(self):
+        """Reset state that outlives each test's transaction."""
+        # Cached users would outlive the previous test's rolled back transaction
+        cache.clear()
 
     def execute_graphql(self, query, variables=None, headers=None):
         """
@@ -113,7 +133,7 @@ class JWTAuthenticationTests(TestCase):
         Args:
             query (str): The GraphQL query or mutation
             variables (dict, optional): Variables for the query
-            headers (dict, optional): HTTP headers including authorization
+            headers (dict, optional): Request META entries, e.g. {AUTH_HEADER: 'Bearer ...'}
             
         Returns:
             dict: The parsed JSON response
@@ -123,18 +143,20 @@ class JWTAuthenticationTests(TestCase):
             'variables': variables or {}
         }
         
-        http_headers = {'Content-Type': 'application/json'}
-        if headers:
-            http_headers.update(headers)
-            
         response = self.client.post(
             self.graphql_url,
-            data=json.dumps(data),
+            data=json_dumps(data),
             content_type='application/json',
-            **({} if not headers else {'HTTP_' + k.upper().replace('-', '_'): v for k, v in headers.items()})
+            **(headers or {})
         )
         
-        return json.loads(response.content)
+        return json_loads(response.content)
+
+    @staticmethod
+    def _issue_tokens(user):
+        """Issue (access, refresh) tokens directly, skipping the login mutation."""
+        refresh = RefreshToken.for_user(user)
+        return str(refresh.access_token), str(refresh)
 
     def test_user_registration(self):
         """Test user registration functionality."""
@@ -149,31 +171,28 @@ class JWTAuthenticationTests(TestCase):
             }
         }
         
-        response = self.execute_graphql(self.register_mutation, variables)
+        response = self.execute_graphql(REGISTER_MUTATION, variables)
         
-        self.assertIn('data', response)
-        self.assertIn('register', response['data'])
-        self.assertTrue(response['data']['register']['success'])
-        self.assertEqual(response['data']['register']['user']['username'], 'newuser')
+        register = response['data']['register']
+        self.assertTrue(register['success'])
+        self.assertEqual(register['user']['username'], 'newuser')
         
         # Test registration with existing username
         variables['input']['email'] = 'another@example.com'
-        response = self.execute_graphql(self.register_mutation, variables)
+        response = self.execute_graphql(REGISTER_MUTATION, variables)
         
-        self.assertIn('data', response)
-        self.assertIn('register', response['data'])
-        self.assertFalse(response['data']['register']['success'])
-        self.assertIn('Username already exists', response['data']['register']['message'])
+        register = response['data']['register']
+        self.assertFalse(register['success'])
+        self.assertIn('Username already exists', register['message'])
         
         # Test registration with existing email
         variables['input']['username'] = 'anotheruser'
         variables['input']['email'] = 'test@example.com'
-        response = self.execute_graphql(self.register_mutation, variables)
+        response = self.execute_graphql(REGISTER_MUTATION, variables)
         
-        self.assertIn('data', response)
-        self.assertIn('register', response['data'])
-        self.assertFalse(response['data']['register']['success'])
-        self.assertIn('Email already exists', response['data']['register']['message'])
+        register = response['data']['register']
+        self.assertFalse(register['success'])
+        self.assertIn('Email already exists', register['message'])
 
     def test_user_login(self):
         """Test user login functionality with correct and incorrect credentials."""
@@ -185,48 +204,33 @@ class JWTAuthenticationTests(TestCase):
             }
         }
         
-        response = self.execute_graphql(self.login_mutation, variables)
+        response = self.execute_graphql(LOGIN_MUTATION, variables)
         
-        self.assertIn('data', response)
-        self.assertIn('login', response['data'])
-        self.assertTrue(response['data']['login']['success'])
-        self.assertIn('tokens', response['data']['login'])
-        self.assertIn('access', response['data']['login']['tokens'])
-        self.assertIn('refresh', response['data']['login']['tokens'])
-        self.assertIn('token', response['data']['login']['tokens']['access'])
-        self.assertIn('token', response['data']['login']['tokens']['refresh'])
+        login = response['data']['login']
+        self.assertTrue(login['success'])
+        self.assertTrue(login['tokens']['access']['token'])
+        self.assertTrue(login['tokens']['refresh']['token'])
         
         # Test login with incorrect username
         variables['input']['username'] = 'wronguser'
-        response = self.execute_graphql(self.login_mutation, variables)
+        response = self.execute_graphql(LOGIN_MUTATION, variables)
         
-        self.assertIn('data', response)
-        self.assertIn('login', response['data'])
-        self.assertFalse(response['data']['login']['success'])
-        self.assertIn('Invalid username or password', response['data']['login']['message'])
+        login = response['data']['login']
+        self.assertFalse(login['success'])
+        self.assertIn('Invalid username or password', login['message'])
         
         # Test login with incorrect password
         variables['input']['username'] = 'testuser'
         variables['input']['password'] = 'wrongpassword'
-        response = self.execute_graphql(self.login_mutation, variables)
+        response = self.execute_graphql(LOGIN_MUTATION, variables)
         
-        self.assertIn('data', response)
-        self.assertIn('login', response['data'])
-        self.assertFalse(response['data']['login']['success'])
-        self.assertIn('Invalid username or password', response['data']['login']['message'])
+        login = response['data']['login']
+        self.assertFalse(login['success'])
+        self.assertIn('Invalid username or password', login['message'])
 
     def test_token_refresh(self):
         """Test token refresh functionality."""
-        # First, login to get tokens
-        variables = {
-            'input': {
-                'username': 'testuser',
-                'password': 'testpassword123'
-            }
-        }
-        
-        login_response = self.execute_graphql(self.login_mutation, variables)
-        refresh_token = login_response['data']['login']['tokens']['refresh']['token']
+        refresh_token = self.user_refresh_token
         
         # Test successful token refresh
         variables = {
@@ -235,100 +239,104 @@ class JWTAuthenticationTests(TestCase):
             }
         }
         
-        response = self.execute_graphql(self.refresh_mutation, variables)
+        response = self.execute_graphql(REFRESH_MUTATION, variables)
         
-        self.assertIn('data', response)
-        self.assertIn('refreshToken', response['data'])
-        self.assertTrue(response['data']['refreshToken']['success'])
-        self.assertIn('tokens', response['data']['refreshToken'])
-        self.assertIn('access', response['data']['refreshToken']['tokens'])
-        self.assertIn('refresh', response['data']['refreshToken']['tokens'])
+        refresh = response['data']['refreshToken']
+        self.assertTrue(refresh['success'])
+        self.assertTrue(refresh['tokens']['access']['token'])
+        self.assertTrue(refresh['tokens']['refresh']['token'])
         
         # Test refresh with invalid token
         variables['input']['refreshToken'] = 'invalid.token.here'
-        response = self.execute_graphql(self.refresh_mutation, variables)
+        response = self.execute_graphql(REFRESH_MUTATION, variables)
         
-        self.assertIn('data', response)
-        self.assertIn('refreshToken', response['data'])
-        self.assertFalse(response['data']['refreshToken']['success'])
-        self.assertIn('Token refresh failed', response['data']['refreshToken']['message'])
+        refresh = response['data']['refreshToken']
+        self.assertFalse(refresh['success'])
+        self.assertIn('Token refresh failed', refresh['message'])
 
     def test_protected_endpoints(self):
         """Test accessing protected endpoints with and without valid tokens."""
-        # First, login to get tokens
-        variables = {
-            'input': {
-                'username': 'testuser',
-                'password': 'testpassword123'
-            }
-        }
-        
-        login_response = self.execute_graphql(self.login_mutation, variables)
-        access_token = login_response['data']['login']['tokens']['access']['token']
+        access_token = self.user_access_token
         
         # Test accessing 'me' endpoint with valid token
-        headers = {'Authorization': f'Bearer {access_token}'}
-        response = self.execute_graphql(self.me_query, headers=headers)
+        headers = {AUTH_HEADER: f'Bearer {access_token}'}
+        response = self.execute_graphql(ME_QUERY, headers=headers)
         
-        self.assertIn('data', response)
-        self.assertIn('me', response['data'])
-        self.assertIsNotNone(response['data']['me'])
-        self.assertEqual(response['data']['me']['username'], 'testuser')
+        me = response['data']['me']
+        self.assertIsNotNone(me)
+        self.assertEqual(me['username'], 'testuser')
         
         # Test accessing 'me' endpoint without token
-        response = self.execute_graphql(self.me_query)
+        response = self.execute_graphql(ME_QUERY)
         
         self.assertIn('errors', response)
         self.assertIn('User is not authenticated', response['errors'][0]['message'])
         
         # Test accessing 'me' endpoint with invalid token
-        headers = {'Authorization': 'Bearer invalid.token.here'}
-        response = self.execute_graphql(self.me_query, headers=headers)
+        headers = {AUTH_HEADER: 'Bearer invalid.token.here'}
+        response = self.execute_graphql(ME_QUERY, headers=headers)
         
         self.assertIn('errors', response)
         self.assertIn('User is not authenticated', response['errors'][0]['message'])
         
         # Test accessing admin-only endpoint as regular user
         variables = {'id': str(self.admin_user.id)}
-        headers = {'Authorization': f'Bearer {access_token}'}
-        response = self.execute_graphql(self.user_query, variables, headers)
+        headers = {AUTH_HEADER: f'Bearer {access_token}'}
+        response = self.execute_graphql(USER_QUERY, variables, headers)
         
         self.assertIn('errors', response)
         self.assertIn('User is not authorized to access this resource', response['errors'][0]['message'])
         
         # Test accessing admin-only endpoint as admin
-        admin_login_variables = {
-            'input': {
-                'username': 'adminuser',
-                'password': 'adminpassword123'
-            }
-        }
+        admin_access_token = self.admin_access_token
         
-        admin_login_response = self.execute_graphql(self.login_mutation, admin_login_variables)
-        admin_access_token = admin_login_response['data']['login']['tokens']['access']['token']
+        variables = {'id': str(self.test_user.id)}
+        headers = {AUTH_HEADER: f'Bearer {admin_access_token}'}
+        response = self.execute_graphql(USER_QUERY, variables, headers)
         
+        user = response['data']['user']
+        self.assertIsNotNone(user)
+        self.assertEqual(user['username'], 'testuser')
+
+    def test_user_query_sees_saved_changes(self):
+        """Test that saving a user drops its cached user(id) entry."""
+        admin_access_token = self.admin_access_token
+        headers = {AUTH_HEADER: f'Bearer {admin_access_token}'}
         variables = {'id': str(self.test_user.id)}
-        headers = {'Authorization': f'Bearer {admin_access_token}'}
-        response = self.execute_graphql(self.user_query, variables, headers)
         
-        self.assertIn('data', response)
-        self.assertIn('user', response['data'])
-        self.assertIsNotNone(response['data']['user'])
-        self.assertEqual(response['data']['user']['username'], 'testuser')
+        response = self.execute_graphql(USER_QUERY, variables, headers)
+        self.assertEqual(response['data']['user']['email'], 'test@example.com')
+        
+        self.test_user.email = 'changed@example.com'
+        # The entry is dropped once the save commits
+        with self.captureOnCommitCallbacks(execute=True):
+            self.test_user.save()
+        
+        response = self.execute_graphql(USER_QUERY, variables, headers)
+        self.assertEqual(response['data']['user']['email'], 'changed@example.com')
+
+    def test_batched_operations(self):
+        """Test that a JSON array body runs every operation and returns a list."""
+        access_token = self.user_access_token
+        
+        response = self.client.post(
+            self.graphql_url,
+            data=json_dumps([
+                {'query': ME_QUERY, 'variables': {}},
+                {'query': USER_QUERY, 'variables': {'id': str(self.admin_user.id)}},
+            ]),
+            content_type='application/json',
+            HTTP_AUTHORIZATION=f'Bearer {access_token}'
+        )
+        results = json_loads(response.content)
+        
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0]['data']['me']['username'], 'testuser')
+        self.assertIn('User is not authorized to access this resource', results[1]['errors'][0]['message'])
 
     def test_logout(self):
         """Test logout functionality."""
-        # First, login to get tokens
-        variables = {
-            'input': {
-                'username': 'testuser',
-                'password': 'testpassword123'
-            }
-        }
-        
-        login_response = self.execute_graphql(self.login_mutation, variables)
-        access_token = login_response['data']['login']['tokens']['access']['token']
-        refresh_token = login_response['data']['login']['tokens']['refresh']['token']
+        access_token, refresh_token = self.user_access_token, self.user_refresh_token
         
         # Test successful logout
         variables = {
@@ -337,12 +345,11 @@ class JWTAuthenticationTests(TestCase):
             }
         }
         
-        headers = {'Authorization': f'Bearer {access_token}'}
-        response = self.execute_graphql(self.logout_mutation, variables, headers)
+        headers = {AUTH_HEADER: f'Bearer {access_token}'}
+        response = self.execute_graphql(LOGOUT_MUTATION, variables, headers)
         
-        self.assertIn('data', response)
-        self.assertIn('logout', response['data'])
-        self.assertTrue(response['data']['logout']['success'])
+        logout = response['data']['logout']
+        self.assertTrue(logout['success'])
         
         # Verify the token is blacklisted by attempting to refresh it
         variables = {
@@ -351,10 +358,9 @@ class JWTAuthenticationTests(TestCase):
             }
         }
         
-        response = self.execute_graphql(self.refresh_mutation, variables)
-        self.assertIn('data', response)
-        self.assertIn('refreshToken', response['data'])
-        self.assertFalse(response['data']['refreshToken']['success'])
+        response = self.execute_graphql(REFRESH_MUTATION, variables)
+        refresh = response['data']['refreshToken']
+        self.assertFalse(refresh['success'])
         
         # Test logout with invalid token
         variables = {
@@ -363,9 +369,8 @@ class JWTAuthenticationTests(TestCase):
             }
         }
         
-        response = self.execute_graphql(self.logout_mutation, variables)
+        response = self.execute_graphql(LOGOUT_MUTATION, variables)
         
-        self.assertIn('data', response)
-        self.assertIn('logout', response['data'])
-        self.assertFalse(response['data']['logout']['success'])
-        self.assertIn('Logout failed', response['data']['logout']['message'])
+        logout = response['data']['logout']
+        self.assertFalse(logout['success'])
+        self.assertIn('Logout failed', logout['message'])
@@ -5,6 +5,7 @@ This module provides helper classes and functions for testing GraphQL APIs,
 including a GraphQLTestClient that simplifies executing GraphQL operations
 in tests and handling authentication.
 """
+import functools
 import json
 from typing import Dict, Any, Optional, Union
 
@@ -14,6 +15,27 @@ from rest_framework_simplejwt.tokens import RefreshToken
 
 from users.models import User
 
+try:
+    # orjson serializes straight to bytes and parses several times faster than json
+    from orjson import dumps as json_dumps, loads as json_loads
+except ImportError:
+    json_dumps, json_loads = json.dumps, json.loads
+
+# One Django test client for every GraphQLTestClient; authentication travels in
+# the Authorization header, so no per-test state lives on it
+_SHARED_CLIENT = Client()
+
+
+@functools.lru_cache(maxsize=None)
+def _endpoint_path(endpoint: str) -> str:
+    return reverse(endpoint)
+
+
+@functools.lru_cache(maxsize=256)
+def _path_parts(path: str) -> tuple:
+    # Tests look up the same few dot paths over and over
+    return tuple(path.split('.'))
+
 
 class GraphQLTestClient:
     """
@@ -55,17 +77,30 @@ class GraphQLTestClient:
         response = client.query('query { me { id } }')
     """
     
-    def __init__(self, endpoint: str = 'graphql'):
+    def __init__(self, endpoint: str = 'graphql', isolated: bool = False):
         """
         Initialize the GraphQL test client.
         
         Args:
             endpoint: The GraphQL endpoint path (default: 'graphql')
+            isolated: Use a dedicated Django test client, e.g. for tests
+                that depend on cookies, instead of the shared one
         """
-        self.client = Client()
-        self.endpoint = reverse(endpoint)
+        self.client = Client() if isolated else _SHARED_CLIENT
+        self.endpoint = _endpoint_path(endpoint)
         self.access_token = None
     
+    @property
+    def access_token(self) -> Optional[str]:
+        """The JWT sent with every request, or None for anonymous requests."""
+        return self._access_token
+    
+    @access_token.setter
+    def access_token(self, token: Optional[str]) -> None:
+        # Build the request META entry once per token rather than per request
+        self._access_token = token
+        self._auth_extra = {'HTTP_AUTHORIZATION': f'Bearer {token}'} if token else {}
+    
     def authenticate(self, user: User) -> None:
         """
         Authenticate the client with a user.
@@ -105,6 +140,21 @@ class GraphQLTestClient:
         """
         return self._execute(mutation, variables)
     
+    def execute(self, query: str, variables: Optional[Dict[str, Any]] = None) -> 'GraphQLResponse':
+        """
+        Execute a GraphQL operation and wrap the undecoded body.
+        
+        The JSON is only parsed once the test reads from the response.
+        
+        Args:
+            query: The GraphQL operation string
+            variables: Optional variables for the operation
+            
+        Returns:
+            GraphQLResponse over the raw response body
+        """
+        return GraphQLResponse(self._post(query, variables))
+    
     def _execute(self, query: str, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Execute a GraphQL operation (query or mutation).
@@ -116,29 +166,24 @@ class GraphQLTestClient:
         Returns:
             Dict containing the parsed GraphQL response
         """
+        return json_loads(self._post(query, variables))
+    
+    def _post(self, query: str, variables: Optional[Dict[str, Any]] = None) -> bytes:
+        """Send a GraphQL operation and return the raw response body."""
         data = {
             'query': query,
             'variables': variables or {}
         }
         
-        headers = {'Content-Type': 'application/json'}
-        if self.access_token:
-            headers['Authorization'] = f'Bearer {self.access_token}'
-        
-        # Convert headers to Django test client format
-        django_headers = {
-            f'HTTP_{key.upper().replace("-", "_")}': value
-            for key, value in headers.items()
-        }
-        
+        # content_type sets the Content-Type header; only the token varies
         response = self.client.post(
             self.endpoint,
-            data=json.dumps(data),
+            data=json_dumps(data),
             content_type='application/json',
-            **django_headers
+            **self._auth_extra
         )
         
-        return json.loads(response.content)
+        return response.content
     
     def clear_authentication(self) -> None:
         """Clear the current authentication."""
@@ -169,7 +214,7 @@ class GraphQLResponse:
     and check for errors.
     
     Example:
-        response = GraphQLResponse(client.query('query { me { id } }'))
+        response = client.execute('query { me { id } }')
         
         if response.has_errors:
             print(response.errors)
@@ -177,20 +222,39 @@ class GraphQLResponse:
             user_id = response.data['me']['id']
     """
     
-    def __init__(self, response_data: Dict[str, Any]):
+    def __init__(self, response_data: Union[bytes, Dict[str, Any]]):
         """
         Initialize with GraphQL response data.
         
         Args:
-            response_data: The parsed GraphQL response
+            response_data: The parsed GraphQL response, or the raw response
+                body, which is then decoded on first access
         """
-        self.response = response_data
-        self.data = response_data.get('data')
-        self.errors = response_data.get('errors', [])
+        if isinstance(response_data, bytes):
+            self._raw = response_data
+        else:
+            self._raw = None
+            self.response = response_data
+    
+    @functools.cached_property
+    def response(self) -> Dict[str, Any]:
+        """The decoded response body."""
+        return json_loads(self._raw)
+    
+    @functools.cached_property
+    def data(self) -> Optional[Dict[str, Any]]:
+        return self.response.get('data')
+    
+    @functools.cached_property
+    def errors(self) -> list:
+        return self.response.get('errors', [])
     
     @property
     def has_errors(self) -> bool:
         """Check if the response has any errors."""
+        # An undecoded body without an "errors" key cannot have errors
+        if self._raw is not None and b'"errors"' not in self._raw:
+            return False
         return len(self.errors) > 0
     
     def get_field_value(self, path: str) -> Any:
@@ -207,11 +271,12 @@ class GraphQLResponse:
             return None
         
         current = self.data
-        for part in path.split('.'):
-            if isinstance(current, dict) and part in current:
+        try:
+            for part in _path_parts(path):
                 current = current[part]
-            else:
-                return None
+        except (KeyError, TypeError):
+            # Missing key, or a non-dict value on the path
+            return None
         
         return current
     
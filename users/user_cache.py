@@ -0,0 +1,64 @@
+"""
+Shared cache of the User rows served by the user(id) query.
+
+Admin dashboards poll the same users over and over, so the UserType columns of
+each loaded user are kept in the Django cache (Redis when REDIS_URL is set),
+keyed by primary key. Entries are dropped by users.signals whenever a User is
+saved or deleted; queryset.update() bypasses those signals, so entries
+changed that way live until the TTL runs out.
+
+The TTL is read from the USER_CACHE_TTL setting (seconds, default 60); set it
+to 0 to disable the cache.
+"""
+from typing import Dict, Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+
+from users.models import User
+
+CACHE_TTL = getattr(settings, 'USER_CACHE_TTL', 60)
+CACHE_PREFIX = 'users:user:'
+
+
+def _key(pk) -> str:
+    return f'{CACHE_PREFIX}{pk}'
+
+
+async def aget_many(ids: Iterable[str]) -> Dict[str, User]:
+    """
+    Return the cached users among ids.
+
+    Args:
+        ids: User primary keys as strings
+
+    Returns:
+        Dict of str(pk) -> User for the ids that were cached
+    """
+    if CACHE_TTL <= 0:
+        return {}
+
+    keys = {_key(id): id for id in ids}
+    found = await cache.aget_many(keys)
+    return {keys[key]: user for key, user in found.items()}
+
+
+async def aset_many(users: Iterable[User]) -> None:
+    """
+    Store freshly loaded users.
+
+    Args:
+        users: Users loaded with the UserType columns
+    """
+    if CACHE_TTL <= 0:
+        return
+
+    await cache.aset_many({_key(user.pk): user for user in users}, CACHE_TTL)
+
+
+def delete(pk) -> None:
+    """Drop the cached entry for one user."""
+    if CACHE_TTL <= 0:
+        return
+
+    cache.delete(_key(pk))
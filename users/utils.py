@@ -1,5 +1,7 @@
+from typing import Iterator, Optional, Tuple, Union
+
 from django.db import transaction
-from typing import Optional, Tuple, Union
+from django.db.models import Q
 
 from users.models import UserRole, User
 
@@ -27,73 +29,119 @@ def create_admin_user(
         - Success status (boolean)
         - Message describing the result
     """
+    # Check username and email collisions with a single query
+    # (at most one row can match the unique username, plus one for the email)
+    conflicts = list(
+        User.objects.filter(Q(username=username) | Q(email=email))
+        .values_list('username', flat=True)[:2]
+    )
+    
     # Check if username already exists
-    if User.objects.filter(username=username).exists():
+    if username in conflicts:
         return None, False, f"User with username '{username}' already exists"
     
     # Check if email already exists
-    if User.objects.filter(email=email).exists():
+    if conflicts:
         return None, False, f"User with email '{email}' already exists"
     
     try:
+        # Create the user with the admin role in one INSERT, no follow-up save;
+        # the savepoint leaves an outer transaction usable if the INSERT is rejected
         with transaction.atomic():
-            # Create the user
             user = User.objects.create_user(
                 username=username,
                 email=email,
                 password=password,
                 first_name=first_name,
-                last_name=last_name
+                last_name=last_name,
+                role=UserRole.ADMIN
             )
-            
-            # Set admin role
-            user.role = UserRole.ADMIN
-            user.save()
-            
-            return user, True, "Admin user created successfully"
+        
+        return user, True, "Admin user created successfully"
     except Exception as e:
         return None, False, f"Failed to create admin user: {str(e)}"
 
 
-def promote_to_admin(user_identifier: Union[str, int]) -> Tuple[User, bool, str]:
+def _get_user(identifier: Union[str, int], **lookup) -> Tuple[Optional[User], str]:
     """
-    Promotes an existing user to admin role.
+    Fetch a user for one of the role helpers.
     
-    Args:
-        user_identifier: Either a username (string) or user ID (int)
-        
     Returns:
-        Tuple containing:
-        - User object (or None if promotion failed)
-        - Success status (boolean)
-        - Message describing the result
+        Tuple of (User object or None, not-found message)
     """
-    user = None
-    
-    # Find the user based on the identifier type
     try:
-        if isinstance(user_identifier, int) or user_identifier.isdigit():
-            user = User.objects.get(id=user_identifier)
-        else:
-            user = User.objects.get(username=user_identifier)
+        return User.objects.get(**lookup), ""
     except User.DoesNotExist:
-        return None, False, f"User not found with identifier: {user_identifier}"
-    
+        return None, f"User not found with identifier: {identifier}"
+
+
+def _promote(user: User) -> Tuple[User, bool, str]:
+    """Promote an already fetched user to admin role."""
     # Check if user is already an admin
-    if hasattr(user, 'profile') and user.profile.is_admin:
+    if user.is_admin:
         return user, False, f"User '{user.username}' is already an admin"
     
     try:
-        # Update user role to admin
-        profile = user.profile
-        profile.role = UserRole.ADMIN
-        profile.save()
+        # Update user role to admin; role lives on the user row, no profile to load
+        user.role = UserRole.ADMIN
+        user.save(update_fields=['role'])
         
         return user, True, f"User '{user.username}' has been promoted to admin"
     except Exception as e:
         return None, False, f"Failed to promote user to admin: {str(e)}"
 
 
+def _demote(user: User) -> Tuple[User, bool, str]:
+    """Demote an already fetched admin user to freemium user."""
+    # Check if user is not an admin
+    if not user.is_admin:
+        return user, False, f"User '{user.username}' is not an admin"
+    
+    try:
+        # Update user role to freemium user
+        user.role = UserRole.FREEMIUM_USER
+        user.save(update_fields=['role'])
+        
+        return user, True, f"User '{user.username}' has been demoted from admin"
+    except Exception as e:
+        return None, False, f"Failed to demote user from admin: {str(e)}"
+
+
+def promote_by_id(user_id: int) -> Tuple[User, bool, str]:
+    """Promotes the user with the given ID to admin role; see promote_to_admin."""
+    user, message = _get_user(user_id, pk=user_id)
+    return _promote(user) if user else (None, False, message)
+
+
+def promote_by_username(username: str) -> Tuple[User, bool, str]:
+    """Promotes the user with the given username to admin role; see promote_to_admin."""
+    user, message = _get_user(username, username=username)
+    return _promote(user) if user else (None, False, message)
+
+
+def promote_to_admin(user_identifier: Union[str, int]) -> Tuple[User, bool, str]:
+    """
+    Promotes an existing user to admin role.
+    
+    Callers that know the identifier type should use promote_by_id or
+    promote_by_username directly.
+    
+    Args:
+        user_identifier: Either a username (string) or user ID (int)
+        
+    Returns:
+        Tuple containing:
+        - User object (or None if promotion failed)
+        - Success status (boolean)
+        - Message describing the result
+    """
+    if isinstance(user_identifier, int):
+        return promote_by_id(user_identifier)
+    if user_identifier.isdigit():
+        return promote_by_id(int(user_identifier))
+    return promote_by_username(user_identifier)
+
+
 def is_admin(user: User) -> bool:
     """
     Checks if a user has admin role.
@@ -107,13 +155,28 @@ def is_admin(user: User) -> bool:
     if not user or not user.is_authenticated:
         return False
     
-    return hasattr(user, 'profile') and user.profile.is_admin
+    return user.is_admin
+
+
+def demote_by_id(user_id: int) -> Tuple[User, bool, str]:
+    """Demotes the admin user with the given ID; see demote_from_admin."""
+    user, message = _get_user(user_id, pk=user_id)
+    return _demote(user) if user else (None, False, message)
+
+
+def demote_by_username(username: str) -> Tuple[User, bool, str]:
+    """Demotes the admin user with the given username; see demote_from_admin."""
+    user, message = _get_user(username, username=username)
+    return _demote(user) if user else (None, False, message)
 
 
 def demote_from_admin(user_identifier: Union[str, int]) -> Tuple[User, bool, str]:
     """
     Demotes an admin user to regular freemium user.
     
+    Callers that know the identifier type should use demote_by_id or
+    demote_by_username directly.
+    
     Args:
         user_identifier: Either a username (string) or user ID (int)
         
@@ -123,30 +186,11 @@ def demote_from_admin(user_identifier: Union[str, int]) -> Tuple[User, bool, str
         - Success status (boolean)
         - Message describing the result
     """
-    user = None
-    
-    # Find the user based on the identifier type
-    try:
-        if isinstance(user_identifier, int) or user_identifier.isdigit():
-            user = User.objects.get(id=user_identifier)
-        else:
-            user = User.objects.get(username=user_identifier)
-    except User.DoesNotExist:
-        return None, False, f"User not found with identifier: {user_identifier}"
-    
-    # Check if user is not an admin
-    if not hasattr(user, 'profile') or not user.profile.is_admin:
-        return user, False, f"User '{user.username}' is not an admin"
-    
-    try:
-        # Update user role to freemium user
-        profile = user.profile
-        profile.role = UserRole.FREEMIUM_USER
-        profile.save()
-        
-        return user, True, f"User '{user.username}' has been demoted from admin"
-    except Exception as e:
-        return None, False, f"Failed to demote user from admin: {str(e)}"
+    if isinstance(user_identifier, int):
+        return demote_by_id(user_identifier)
+    if user_identifier.isdigit():
+        return demote_by_id(int(user_identifier))
+    return demote_by_username(user_identifier)
 
 
 def get_all_admins() -> list:
@@ -156,4 +200,22 @@ def get_all_admins() -> list:
     Returns:
         List of User objects with admin role
     """
-    return User.objects.filter(profile__role=UserRole.ADMIN)
+    # role is a User column (indexed); there is no profile relation
+    return User.objects.filter(role=UserRole.ADMIN)
+
+
+def iter_admins() -> Iterator[dict]:
+    """
+    Streams the id, username and email of every admin user.
+    
+    Prefer this over get_all_admins when only those fields are needed; rows
+    arrive through a server-side cursor and no model instances are built.
+    
+    Returns:
+        Iterator of dicts with 'id', 'username' and 'email' keys
+    """
+    return (
+        User.objects.filter(role=UserRole.ADMIN)
+        .values('id', 'username', 'email')
+        .iterator(chunk_size=500)
+    )